@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collector', '0006_remove_searchquery_last_tweet_timestamp_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tweet',
+            index=models.Index(fields=['collected_at', 'is_valid'], name='collector_t_collect_79564b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tweet',
+            index=models.Index(fields=['user', 'created_at'], name='collector_t_user_id_13f126_idx'),
+        ),
+    ]
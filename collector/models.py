@@ -63,6 +63,9 @@ class Tweet(models.Model):
             models.Index(fields=['created_at']),
             models.Index(fields=['importance_score']),
             models.Index(fields=['engagement_score']),
+            # فیلترهای پردازشگر: توییت‌های تازه جمع‌آوری‌شده، و توییت‌های اخیر هر کاربر (اسپم)
+            models.Index(fields=['collected_at', 'is_valid']),
+            models.Index(fields=['user', 'created_at']),
         ]
         verbose_name = 'Tweet'
         verbose_name_plural = 'Tweets'
@@ -11,6 +11,7 @@ import json
 from typing import Dict, Any
 
 from lib.twitter_api.middleware import OptimizedTwitterAPIClient
+from lib.twitter_api.utils.date_utils import format_display_date
 
 # تنظیم لاگر
 logging.basicConfig(
@@ -83,7 +84,7 @@ def example_search_tweets(client: OptimizedTwitterAPIClient) -> None:
             print(f"\nنمونه توییت:")
             print(f"- متن: {tweets[0].text}")
             print(f"- نویسنده: @{tweets[0].author.username if tweets[0].author else 'ناشناس'}")
-            print(f"- تاریخ: {tweets[0].created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"- تاریخ: {format_display_date(tweets[0].created_at)}")
 
         # نمایش وضعیت بودجه بعد از درخواست اول
         status = client.get_budget_status()
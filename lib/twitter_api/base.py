@@ -4,11 +4,19 @@ Base client for TwitterAPI.io.
 کلاس پایه برای ارتباط با TwitterAPI.io
 """
 
+import json
 import logging
+import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
 from lib.twitter_api.exceptions import (
     TwitterAPIAuthError,
@@ -23,6 +31,13 @@ from lib.twitter_api.exceptions import (
 from lib.twitter_api.utils.validators import validate_api_key
 
 
+def _loads(content: bytes) -> Any:
+    """Decode a JSON response body straight from bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
 class TwitterAPIBase:
     """
     Base class for TwitterAPI.io client with low-level request handling.
@@ -35,6 +50,12 @@ class TwitterAPIBase:
     DEFAULT_MAX_RETRIES = 3
     DEFAULT_BACKOFF_FACTOR = 0.5
     DEFAULT_API_VERSION = ""  # نسخه پیش‌فرض API (خالی برای نسخه فعلی)
+    DEFAULT_POOL_SIZE = 32  # تعداد اتصال‌های keep-alive قابل استفاده مجدد (برای درخواست‌های هم‌زمان)
+    MAX_RATE_LIMIT_WAIT = 900  # seconds; one 15-minute rate-limit window
+
+    # Rate-limit headers (both spellings are seen in the wild; lookups are case-insensitive)
+    RATE_LIMIT_REMAINING_HEADERS = ("X-Rate-Limit-Remaining", "X-RateLimit-Remaining")
+    RATE_LIMIT_RESET_HEADERS = ("X-Rate-Limit-Reset", "X-RateLimit-Reset")
 
     def __init__(self,
                  api_key: str,
@@ -72,8 +93,16 @@ class TwitterAPIBase:
         # Setup logger
         self.logger = logger or logging.getLogger(__name__)
 
-        # Setup session
+        # Rate-limit window reported by the API: when the remaining quota hits
+        # zero, requests wait for the reset instead of being rejected with 429
+        self._rate_limit_reset_at: Optional[float] = None
+        self._rate_limit_lock = threading.Lock()
+
+        # Setup session (one pooled keep-alive adapter shared by all requests)
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.DEFAULT_POOL_SIZE, pool_maxsize=self.DEFAULT_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "X-API-Key": self.api_key,
             "Content-Type": "application/json",
@@ -135,6 +164,7 @@ class TwitterAPIBase:
 
         for attempt in range(self.max_retries + 1):
             try:
+                self._wait_for_rate_limit(endpoint)
                 response = self.session.request(
                     method=method,
                     url=url,
@@ -146,6 +176,9 @@ class TwitterAPIBase:
                 # Log raw response for debugging
                 self.logger.debug(f"Raw response for {endpoint}: {response.text}")
 
+                # Track the remaining quota before checking for errors
+                self._update_rate_limit(response.headers)
+
                 # Check if the request was successful
                 self._check_response(response)
 
@@ -157,6 +190,10 @@ class TwitterAPIBase:
             except TwitterAPIRateLimitError as e:
                 if attempt < self.max_retries:
                     wait_time = self._calculate_backoff_time(attempt)
+                    # Retrying before the window resets would only be rejected again
+                    if e.reset_time is not None:
+                        reset_at = self._reset_epoch(e.reset_time)
+                        wait_time = max(wait_time, min(reset_at - time.time(), self.MAX_RATE_LIMIT_WAIT))
                     self.logger.warning(f"Rate limited. Retrying in {wait_time:.2f} seconds...")
                     time.sleep(wait_time)
                 else:
@@ -194,7 +231,7 @@ class TwitterAPIBase:
             TwitterAPIError: If there's an error in the response
         """
         try:
-            response_json = response.json() if response.content else {}
+            response_json = _loads(response.content) if response.content else {}
         except ValueError:
             response_json = {}
 
@@ -227,12 +264,7 @@ class TwitterAPIBase:
                                             response=response_json)
 
             elif response.status_code == 429:
-                reset_time = None
-                if "X-Rate-Limit-Reset" in response.headers:
-                    try:
-                        reset_time = int(response.headers["X-Rate-Limit-Reset"])
-                    except (ValueError, TypeError):
-                        pass
+                reset_time = self._header_int(response.headers, self.RATE_LIMIT_RESET_HEADERS)
 
                 raise TwitterAPIRateLimitError(f"Rate limit exceeded: {error_message}",
                                              status_code=response.status_code,
@@ -271,7 +303,7 @@ class TwitterAPIBase:
             return {}
 
         try:
-            return response.json()
+            return _loads(response.content)
         except ValueError as e:
             raise TwitterAPIError(f"Invalid JSON response: {response.text}") from e
 
@@ -355,6 +387,68 @@ class TwitterAPIBase:
 
         return normalized
 
+    @staticmethod
+    def _header_int(headers: Any, names: Tuple[str, ...]) -> Optional[int]:
+        """Return the first of the given headers that holds an integer, else None."""
+        for name in names:
+            value = headers.get(name)
+            if value is not None:
+                try:
+                    return int(value)
+                except (ValueError, TypeError):
+                    pass
+        return None
+
+    @staticmethod
+    def _reset_epoch(reset_time: int) -> float:
+        """Convert a rate-limit reset header value to an epoch timestamp.
+
+        Twitter-style headers carry an epoch time; small values are treated
+        as seconds until the reset.
+        """
+        if reset_time < 1_000_000_000:
+            return time.time() + reset_time
+        return float(reset_time)
+
+    def _update_rate_limit(self, headers: Any) -> None:
+        """
+        Record the rate-limit window from response headers.
+
+        Args:
+            headers: Response headers
+        """
+        remaining = self._header_int(headers, self.RATE_LIMIT_REMAINING_HEADERS)
+        if remaining is None:
+            return
+
+        reset_time = self._header_int(headers, self.RATE_LIMIT_RESET_HEADERS)
+        with self._rate_limit_lock:
+            if remaining <= 0 and reset_time is not None:
+                self._rate_limit_reset_at = self._reset_epoch(reset_time)
+            else:
+                self._rate_limit_reset_at = None
+
+    def _wait_for_rate_limit(self, endpoint: str) -> None:
+        """
+        Wait for the rate-limit window to reset if the quota is exhausted.
+
+        Args:
+            endpoint: API endpoint (for logging)
+        """
+        with self._rate_limit_lock:
+            reset_at = self._rate_limit_reset_at
+        if reset_at is None:
+            return
+
+        wait_time = min(reset_at - time.time(), self.MAX_RATE_LIMIT_WAIT)
+        if wait_time > 0:
+            self.logger.warning(f"Rate limit quota exhausted. Waiting {wait_time:.2f} seconds before {endpoint}...")
+            time.sleep(wait_time)
+
+        with self._rate_limit_lock:
+            if self._rate_limit_reset_at == reset_at:
+                self._rate_limit_reset_at = None
+
     def _calculate_backoff_time(self, attempt: int) -> float:
         """
         Calculate backoff time for retry with exponential backoff.
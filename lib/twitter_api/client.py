@@ -12,7 +12,7 @@ from lib.twitter_api.base import TwitterAPIBase
 from lib.twitter_api.exceptions import TwitterAPIError, TwitterAPIValidationError
 from lib.twitter_api.models import Tweet, User, WebhookRule
 from lib.twitter_api.utils.date_utils import validate_time_range
-from lib.twitter_api.utils.pagination import PaginatedIterator, paginate_resource
+from lib.twitter_api.utils.pagination import PaginatedIterator, paginate_resource, submit_prefetch
 from lib.twitter_api.utils.validators import (
     validate_boolean_param,
     validate_cursor,
@@ -32,6 +32,9 @@ class TwitterAPIClient:
     این کلاس متدهای سطح بالا برای استفاده راحت از API های TwitterAPI.io را فراهم می‌کند
     """
 
+    # Maximum length of the comma-separated userIds query value (keeps URLs well under 8 KB)
+    MAX_USER_IDS_PARAM_LENGTH = 6000
+
     def __init__(
         self,
         api_key: str,
@@ -132,6 +135,7 @@ class TwitterAPIClient:
         max_pages: Optional[int] = None,
         max_results: Optional[int] = None,
         convert_to_models: bool = True,
+        prefetch: bool = False,
     ) -> Iterable[Union[Dict[str, Any], Tweet]]:
         """
         Search for tweets using Twitter's advanced search syntax, returning an iterator.
@@ -146,6 +150,7 @@ class TwitterAPIClient:
             max_pages: Maximum number of pages to retrieve
             max_results: Maximum number of results to return
             convert_to_models: Whether to convert results to Tweet objects
+            prefetch: Fetch the next page in the background while the current one is consumed
 
         Returns:
             Iterator of tweets (as dictionaries or Tweet objects)
@@ -181,6 +186,7 @@ class TwitterAPIClient:
             max_pages=max_pages,
             max_items=max_results,
             initial_cursor=cursor,
+            prefetch=prefetch,
         )
 
     #
@@ -266,6 +272,7 @@ class TwitterAPIClient:
         max_pages: Optional[int] = None,
         max_results: Optional[int] = None,
         convert_to_models: bool = True,
+        prefetch: bool = False,
     ) -> Iterable[Union[Dict[str, Any], Tweet]]:
         """
         Get replies to a specific tweet, returning an iterator.
@@ -281,6 +288,7 @@ class TwitterAPIClient:
             max_pages: Maximum number of pages to retrieve
             max_results: Maximum number of results to return
             convert_to_models: Whether to convert results to Tweet objects
+            prefetch: Fetch the next page in the background while the current one is consumed
 
         Returns:
             Iterator of reply tweets (as dictionaries or Tweet objects)
@@ -322,6 +330,7 @@ class TwitterAPIClient:
             max_pages=max_pages,
             max_items=max_results,
             initial_cursor=cursor,
+            prefetch=prefetch,
         )
 
     #
@@ -518,6 +527,7 @@ class TwitterAPIClient:
             max_pages: Optional[int] = None,
             max_results: Optional[int] = None,
             convert_to_models: bool = True,
+            prefetch: bool = False,
     ) -> Iterable[Union[Dict[str, Any], Tweet]]:
         """
         Get tweets from a specific user, returning an iterator.
@@ -535,6 +545,7 @@ class TwitterAPIClient:
             max_pages: Maximum number of pages to retrieve
             max_results: Maximum number of results to return
             convert_to_models: Whether to convert results to Tweet objects
+            prefetch: Fetch the next page in the background while the current one is consumed
 
         Returns:
             Iterator of tweets (as dictionaries or Tweet objects)
@@ -563,7 +574,7 @@ class TwitterAPIClient:
 
         # کلاس ایتریتور سفارشی برای مدیریت ساختار خاص پاسخ
         class UserTweetsIterator:
-            def __init__(self, client, username, user_id, cursor_val, max_pg, max_items, transform):
+            def __init__(self, client, username, user_id, cursor_val, max_pg, max_items, transform, prefetch):
                 self.client = client
                 self.username = username
                 self.user_id = user_id
@@ -571,6 +582,8 @@ class TwitterAPIClient:
                 self.max_pages = max_pg
                 self.max_items = max_items
                 self.transform = transform
+                self.prefetch = prefetch
+                self.next_page_future = None
 
                 self.page_count = 0
                 self.item_count = 0
@@ -612,16 +625,24 @@ class TwitterAPIClient:
 
                 return item
 
-            def _fetch_next_page(self):
+            def _request_page(self, cursor):
                 # Prepare parameters
-                params = {"cursor": self.cursor}
+                params = {"cursor": cursor}
                 if self.user_id is not None:
                     params["userId"] = self.user_id
                 else:
                     params["userName"] = self.username
 
                 # Make API request
-                response = self.client.base.make_request("GET", "twitter/user/last_tweets", params=params)
+                return self.client.base.make_request("GET", "twitter/user/last_tweets", params=params)
+
+            def _fetch_next_page(self):
+                # Use the prefetched page if one is in flight
+                if self.next_page_future is not None:
+                    future, self.next_page_future = self.next_page_future, None
+                    response = future.result()
+                else:
+                    response = self._request_page(self.cursor)
                 self.page_count += 1
 
                 # Extract tweets (after normalization, they're in 'tweets')
@@ -633,6 +654,14 @@ class TwitterAPIClient:
                 self.has_more = response.get("has_next_page", False)
                 self.cursor = response.get("next_cursor", "")
 
+                # Start fetching the next page while this one is consumed; after an
+                # empty page only the single retry below will request another one
+                if (self.prefetch and self.has_more
+                        and (tweets or self.page_count < 2)
+                        and (self.max_pages is None or self.page_count < self.max_pages)
+                        and (self.max_items is None or self.item_count + len(tweets) < self.max_items)):
+                    self.next_page_future = submit_prefetch(self._request_page, self.cursor)
+
                 # If this page had no tweets but has_next_page is True,
                 # we'll try one more page before giving up
                 if not tweets and self.has_more and self.page_count < 2:
@@ -646,7 +675,8 @@ class TwitterAPIClient:
             cursor_value,
             max_pages,
             max_results,
-            transform_func
+            transform_func,
+            prefetch
         )
 
     def get_user_mentions(
@@ -765,7 +795,7 @@ class TwitterAPIClient:
 
         # Convert to model objects if requested
         if convert_to_models:
-            return [User.from_dict(user_data) for user_data in followers]
+            return User.from_list(followers)
 
         return followers
 
@@ -821,7 +851,7 @@ class TwitterAPIClient:
 
         # Convert to model objects if requested
         if convert_to_models:
-            return [User.from_dict(user_data) for user_data in following]
+            return User.from_list(following)
 
         return following
 
@@ -852,15 +882,26 @@ class TwitterAPIClient:
         if not user_ids:
             raise TwitterAPIValidationError("user_ids cannot be empty")
 
-        # Make request
-        params = {"userIds": ",".join(user_ids)}
-        response = self.base.make_request("GET", "twitter/user/batch_info_by_ids", params=params)
+        # Coerce IDs to strings in a single pass (callers may pass ints)
+        joined_ids = ",".join(map(str, user_ids))
+
+        # Split into several requests if the ID list would overflow the URL length limit
+        if len(joined_ids) <= self.MAX_USER_IDS_PARAM_LENGTH:
+            id_chunks = [joined_ids]
+        else:
+            id_chunks = self._chunk_joined_ids(joined_ids, self.MAX_USER_IDS_PARAM_LENGTH)
+
+        # Make request(s)
+        users = []
+        for chunk in id_chunks:
+            params = {"userIds": chunk}
+            response = self.base.make_request("GET", "twitter/user/batch_info_by_ids", params=params)
+            users.extend(response.get("users", []))
 
         # Convert to model objects if requested
-        users = response.get("users", [])
 
         if convert_to_models:
-            return [User.from_dict(user_data) for user_data in users]
+            return User.from_list(users)
 
         return users
 
@@ -1016,9 +1057,16 @@ class TwitterAPIClient:
             "is_effect": 0,  # New rules are inactive by default
         }
 
-        # Convert to model object if requested
+        # Build the model directly from the validated values
         if convert_to_model:
-            return WebhookRule.from_dict(rule_data)
+            return WebhookRule(
+                tag=tag,
+                value=value,
+                interval_seconds=interval_seconds,
+                rule_id=rule_id,
+                is_active=False,
+                raw_data=rule_data,
+            )
 
         return rule_data
 
@@ -1098,6 +1146,32 @@ class TwitterAPIClient:
     # Helper Methods
     #
 
+    @staticmethod
+    def _chunk_joined_ids(joined_ids: str, max_length: int) -> List[str]:
+        """
+        Split a comma-separated ID string into chunks no longer than max_length.
+
+        Args:
+            joined_ids: Comma-separated user IDs
+            max_length: Maximum length of each chunk
+
+        Returns:
+            List of comma-separated ID chunks
+        """
+        chunks = []
+        start = 0
+        end = len(joined_ids)
+        while start < end:
+            if end - start <= max_length:
+                chunks.append(joined_ids[start:])
+                break
+            split_at = joined_ids.rfind(",", start, start + max_length + 1)
+            if split_at <= start:
+                raise TwitterAPIValidationError("A single user ID exceeds the maximum request length")
+            chunks.append(joined_ids[start:split_at])
+            start = split_at + 1
+        return chunks
+
     def _convert_tweets_with_authors(self, tweets_data: List[Dict[str, Any]]) -> List[Tweet]:
         """
         Convert tweet dictionaries to Tweet objects with authors.
@@ -1108,7 +1182,13 @@ class TwitterAPIClient:
         Returns:
             List of Tweet objects with authors
         """
-        return [self._convert_tweet_with_author(tweet_data) for tweet_data in tweets_data]
+        tweets = Tweet.from_list(tweets_data)
+        user_from_dict = User.from_dict
+        for tweet, tweet_data in zip(tweets, tweets_data):
+            author_data = tweet_data.get("author")
+            if author_data:
+                tweet.author = user_from_dict(author_data)
+        return tweets
 
     def _convert_tweet_with_author(self, tweet_data: Dict[str, Any]) -> Tweet:
         """
@@ -5,14 +5,41 @@
 فراهم می‌کند. با استفاده از این سیستم، می‌توان از مصرف بیش از حد اعتبار جلوگیری کرد.
 """
 
+import atexit
 import json
 import logging
 import threading
+import time
+import weakref
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson اختیاری است؛ در نبود آن از json استاندارد استفاده می‌شود
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# نمونه‌هایی که فایل گزارش باز دارند؛ WeakSet تا ثبت در atexit آن‌ها را زنده نگه ندارد
+_open_report_budgets = weakref.WeakSet()
+
+
+def _close_open_reports() -> None:
+    """بستن فایل‌های گزارش باز در پایان برنامه (یک hook برای همه نمونه‌ها)"""
+    for budget in list(_open_report_budgets):
+        budget.close()
+
+
+atexit.register(_close_open_reports)
+
+
+def _dump_usage_line(usage_info: Dict[str, Any]) -> bytes:
+    """تبدیل یک رکورد مصرف به یک خط JSON (بایت)"""
+    if orjson is not None:
+        return orjson.dumps(usage_info, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(usage_info) + "\n").encode('utf-8')
+
 
 class TwitterAPIBudget:
     """مدیریت بودجه TwitterAPI برای جلوگیری از مصرف بیش از حد"""
@@ -28,6 +55,15 @@ class TwitterAPIBudget:
     # نرخ تبدیل دلار به اعتبار
     USD_TO_CREDITS = 100000  # 1 دلار = 100,000 اعتبار
 
+    # حداقل اعتبار هر درخواست
+    MIN_REQUEST_CREDITS = CREDITS['request']
+
+    # اعتبار به ازای هر واحد منبع (تقسیم بر 1000 از قبل انجام شده است)
+    CREDITS_PER_UNIT = {resource: credits / 1000 for resource, credits in CREDITS.items()}
+
+    # بیشترین فاصله (ثانیه) بین flush های فایل گزارش؛ بین آن‌ها بافر (8KB) خطوط را جمع می‌کند
+    REPORT_FLUSH_INTERVAL = 1.0
+
     def __init__(self,
                  daily_budget_usd: float = 0.5,
                  reset_hour: int = 0,
@@ -51,10 +87,23 @@ class TwitterAPIBudget:
         self.last_reset = datetime.now().replace(hour=reset_hour, minute=0, second=0, microsecond=0)
         if datetime.now().hour < reset_hour:
             self.last_reset -= timedelta(days=1)
+        # زمان بازنشانی بعدی به صورت epoch تا بررسی هر درخواست فقط یک مقایسه عددی باشد
+        self._next_reset_ts = (self.last_reset + timedelta(days=1)).timestamp()
 
         self.lock = threading.Lock()
         self.usage_history = []
 
+        # فایل گزارش یک بار باز و نگه داشته می‌شود؛ خطوط بافر و حداکثر هر
+        # REPORT_FLUSH_INTERVAL ثانیه، در flush_report و در پایان برنامه flush می‌شوند
+        self._report_fh = None
+        self._last_report_flush = time.monotonic()
+        if report_file:
+            try:
+                self._report_fh = open(report_file, 'ab')
+                _open_report_budgets.add(self)
+            except OSError as e:
+                logger.error(f"خطا در باز کردن فایل گزارش مصرف: {str(e)}")
+
         logger.info(f"سیستم مدیریت بودجه راه‌اندازی شد. بودجه روزانه: ${daily_budget_usd:.2f}")
 
     def calculate_cost(self, resource_type: str = 'request', count: int = 1) -> float:
@@ -68,10 +117,13 @@ class TwitterAPIBudget:
         Returns:
             هزینه به اعتبار
         """
-        cost_per_1000 = self.CREDITS.get(resource_type, self.CREDITS['request'])
-        resource_cost = (count * cost_per_1000) / 1000
+        per_unit = self.CREDITS_PER_UNIT.get(resource_type)
+        if per_unit is None:
+            per_unit = self.CREDITS_PER_UNIT['request']
+        resource_cost = count * per_unit
         # هر درخواست حداقل 15 اعتبار هزینه دارد
-        return max(resource_cost, self.CREDITS['request'])
+        min_cost = self.MIN_REQUEST_CREDITS
+        return resource_cost if resource_cost >= min_cost else min_cost
 
     def check_budget(self, resource_type: str = 'request', count: int = 1) -> bool:
         """
@@ -128,10 +180,13 @@ class TwitterAPIBudget:
             self.usage_history.append(usage_info)
 
             # ثبت در فایل گزارش
-            if self.report_file:
+            if self._report_fh is not None:
                 try:
-                    with open(self.report_file, 'a', encoding='utf-8') as f:
-                        f.write(json.dumps(usage_info) + "\n")
+                    self._report_fh.write(_dump_usage_line(usage_info))
+                    now = time.monotonic()
+                    if now - self._last_report_flush >= self.REPORT_FLUSH_INTERVAL:
+                        self._report_fh.flush()
+                        self._last_report_flush = now
                 except Exception as e:
                     logger.error(f"خطا در ثبت گزارش مصرف: {str(e)}")
 
@@ -142,6 +197,19 @@ class TwitterAPIBudget:
 
             return cost
 
+    def flush_report(self) -> None:
+        """تخلیه بافر فایل گزارش مصرف روی دیسک"""
+        with self.lock:
+            if self._report_fh is not None and not self._report_fh.closed:
+                self._report_fh.flush()
+
+    def close(self) -> None:
+        """بستن فایل گزارش مصرف"""
+        with self.lock:
+            if self._report_fh is not None and not self._report_fh.closed:
+                self._report_fh.close()
+        _open_report_budgets.discard(self)
+
     def get_status(self) -> Dict[str, Any]:
         """
         دریافت وضعیت فعلی بودجه
@@ -171,12 +239,11 @@ class TwitterAPIBudget:
         Returns:
             True اگر بازنشانی انجام شد، False در غیر این صورت
         """
-        now = datetime.now()
-        next_reset = self.last_reset + timedelta(days=1)
-        if now >= next_reset:
+        if time.time() >= self._next_reset_ts:
             old_spent = self.spent_today
             self.spent_today = 0
-            self.last_reset = now.replace(hour=self.reset_hour, minute=0, second=0, microsecond=0)
+            self.last_reset = datetime.now().replace(hour=self.reset_hour, minute=0, second=0, microsecond=0)
+            self._next_reset_ts = (self.last_reset + timedelta(days=1)).timestamp()
 
             logger.info(
                 f"بودجه بازنشانی شد. مصرف دیروز: {old_spent} اعتبار "
@@ -1,15 +1,131 @@
 """
 Cache system for TwitterAPI.io.
+
+Entries are stored in a single SQLite database (WAL mode) inside ``cache_dir``,
+so a lookup is one indexed SELECT instead of a stat/open/read per JSON file.
+JSON files of the old one-file-per-key layout are neither read nor removed:
+they are keyed by a hash of the request alone, so they cannot be re-keyed.
 """
+import atexit
 import hashlib
 import json
 import logging
 import os
-from datetime import datetime, timedelta
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import timedelta
 from typing import Any, Dict, Optional, Union
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key BLOB PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    ttl INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    atime REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS cache_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    size INTEGER NOT NULL,
+    files INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_stats (id, size, files) VALUES (1, 0, 0);
+CREATE TRIGGER IF NOT EXISTS cache_stats_insert AFTER INSERT ON cache BEGIN
+    UPDATE cache_stats SET size = size + LENGTH(NEW.payload), files = files + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_stats_update AFTER UPDATE OF payload ON cache BEGIN
+    UPDATE cache_stats SET size = size - LENGTH(OLD.payload) + LENGTH(NEW.payload) WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_stats_delete AFTER DELETE ON cache BEGIN
+    UPDATE cache_stats SET size = size - LENGTH(OLD.payload), files = files - 1 WHERE id = 1;
+END;
+"""
+
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize a payload to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def _canonical_params(params: Dict[str, Any]) -> bytes:
+    """Serialize request params with sorted keys (stable input for the cache key)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass  # non-str keys or unsupported values: the stdlib path below stringifies them
+    # same bytes as orjson (compact, unescaped UTF-8), so keys do not depend on it being installed
+    return json.dumps(params, sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+                      default=str).encode('utf-8')
+
+
+def _loads(payload: bytes) -> Any:
+    """Deserialize a payload written by _dumps."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+_GET_SQL = "SELECT payload, ts, ttl FROM cache WHERE key = ?"
+_TOUCH_SQL = "UPDATE cache SET atime = ? WHERE key = ?"
+_SET_SQL = (
+    "INSERT INTO cache (key, endpoint, ts, ttl, payload, atime) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET endpoint = excluded.endpoint, ts = excluded.ts, "
+    "ttl = excluded.ttl, payload = excluded.payload, atime = excluded.atime"
+)
+_STATS_SQL = "SELECT size, files FROM cache_stats WHERE id = 1"
+
+# live caches; a WeakSet so the atexit hook does not keep them (and their
+# database connection and writer thread) alive
+_open_caches = weakref.WeakSet()
+
+
+def _flush_open_caches() -> None:
+    """Persist queued writes of every live cache at interpreter exit (one hook for all instances)."""
+    for cache in list(_open_caches):
+        cache.flush()
+
+
+atexit.register(_flush_open_caches)
+
+
+def _writer_loop(cache_ref: "weakref.ReferenceType[TwitterAPICache]", write_q: queue.Queue) -> None:
+    """
+    Body of a cache's writer thread.
+
+    Holds only a weak reference between rows, so a cache that is dropped
+    without close() can still be collected; its finalizer then queues the
+    stop sentinel (rows still queued at that point are discarded).
+    """
+    while True:
+        item = write_q.get()
+        try:
+            if item is None:
+                return
+            cache = cache_ref()
+            if cache is None:
+                return
+            cache._write_row(item)
+            del cache
+        finally:
+            write_q.task_done()
+
+
 class TwitterAPICache:
     DEFAULT_TTL_MAPPING = {
         'twitter/user/info': 3600,
@@ -23,18 +139,68 @@ class TwitterAPICache:
         'twitter/list/tweets': 1800,
     }
 
+    DB_FILENAME = 'cache.sqlite'
+    # upper bound for the in-memory set of keys known to be missing
+    MAX_MISSING_KEYS = 10000
+    # seconds a negative entry is trusted; rows written by other processes
+    # sharing the database become visible after at most this long
+    MISSING_TTL = 5
+    # number of serialized payloads kept in the in-process LRU in front of SQLite
+    MEMORY_CACHE_SIZE = 1024
+
     def __init__(self, cache_dir: str = '.twitter_cache', ttl_mapping: Optional[Dict[str, int]] = None, max_cache_size_mb: int = 100):
         self.cache_dir = cache_dir
         self.ttl_mapping = self.DEFAULT_TTL_MAPPING.copy()
         if ttl_mapping:
             self.ttl_mapping.update(ttl_mapping)
+        self._ttl_cache: Dict[str, int] = {}
         self.max_cache_size = max_cache_size_mb * 1024 * 1024
         self.stats = {'hits': 0, 'misses': 0, 'size': 0}
         os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, self.DB_FILENAME)
+        self.lock = threading.Lock()
+        # key -> time until which the key is known to be missing
+        self._missing: Dict[bytes, float] = {}
+        # bumped by every set(); a get() only records a miss if no set() ran meanwhile
+        self._generation = 0
+        self._mem: OrderedDict = OrderedDict()
+        self._mem_lock = threading.Lock()
+        self.db = self._connect()
         self._calculate_cache_stats()
-        logger.info(f"Cache initialized. Path: {cache_dir}, files: {self.stats.get('files', 0)}, size: {self.stats.get('size_mb', 0):.2f} MB")
+        # writes are persisted by a background thread; rows not yet written
+        # stay in _pending so a read-after-write in this process still hits
+        self._pending: Dict[bytes, tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._write_q = queue.Queue()
+        self._writer = threading.Thread(target=_writer_loop, args=(weakref.ref(self), self._write_q),
+                                        name='twitter-cache-writer', daemon=True)
+        self._writer.start()
+        # stop the writer thread if the cache is collected without close()
+        weakref.finalize(self, self._write_q.put, None)
+        _open_caches.add(self)
+        logger.info(f"Cache initialized. Path: {self.db_path}, files: {self.stats.get('files', 0)}, size: {self.stats.get('size_mb', 0):.2f} MB")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        # page_size must be set before the database file is first written
+        db.execute("PRAGMA page_size=8192")
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA mmap_size=268435456")
+        # page cache (negative value = KiB): keeps typical 10-100 KiB payloads in memory
+        db.execute("PRAGMA cache_size=-16384")
+        db.executescript(_SCHEMA)
+        columns = {row[1] for row in db.execute("PRAGMA table_info(cache)")}
+        if 'atime' not in columns:
+            # databases created before LRU eviction: start with write time as access time
+            db.execute("ALTER TABLE cache ADD COLUMN atime REAL NOT NULL DEFAULT 0")
+            db.execute("UPDATE cache SET atime = ts")
+        db.execute("DROP INDEX IF EXISTS cache_ts_idx")
+        db.execute("CREATE INDEX IF NOT EXISTS cache_atime_idx ON cache (atime)")
+        return db
 
-    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_results: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_results: Optional[int] = None,
+            key: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
         """
         Retrieve data from cache if available and valid.
 
@@ -42,38 +208,64 @@ class TwitterAPICache:
             endpoint: API endpoint
             params: Request parameters
             max_results: Requested number of results (to ensure cache compatibility)
+            key: Precomputed key from make_key() (computed from the arguments if None)
 
         Returns:
             Cached data or None if cache is invalid or insufficient
         """
-        key = self._get_cache_key(endpoint, params, max_results)
-        cache_path = os.path.join(self.cache_dir, f"{key}.json")
+        if key is None:
+            key = self.make_key(endpoint, params, max_results)
 
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                cache_time = datetime.fromisoformat(cache_data['timestamp'])
-                ttl = self._get_ttl_for_endpoint(endpoint)
-                if datetime.now() - cache_time < timedelta(seconds=ttl):
-                    # بررسی تعداد آیتم‌ها در کش
-                    if max_results is not None and endpoint.endswith("tweet/advanced_search"):
-                        tweets = cache_data['data'].get('tweets', [])
-                        if len(tweets) < max_results:
-                            logger.debug(f"Cache ignored for {endpoint}: {len(tweets)} items, needed {max_results}")
-                            self.stats['misses'] += 1
-                            return None
-                    self.stats['hits'] += 1
-                    logger.debug(f"Cache hit for {endpoint}")
-                    return cache_data['data']
+        now = time.time()
+        data = None
+        try:
+            # the LRU holds serialized bytes; each hit is decoded into a fresh object,
+            # so callers mutating the result cannot change what later get() calls return
+            payload = self._mem_get(key, now)
+            if payload is not None:
+                data = _loads(payload)
+            elif self._missing.get(key, 0) <= now:
+                # no fresh negative entry for this key: look it up
+                generation = self._generation
+                row = self._pending.get(key)
+                if row is None:
+                    with self.lock:
+                        row = self.db.execute(_GET_SQL, (key,)).fetchone()
+                if row is None:
+                    # a set() that ran after the lookup started (even one already
+                    # written and dropped from _pending) bumped the generation
+                    with self._pending_lock:
+                        if self._generation == generation and key not in self._pending:
+                            if len(self._missing) >= self.MAX_MISSING_KEYS:
+                                self._missing.clear()
+                            self._missing[key] = now + self.MISSING_TTL
                 else:
-                    logger.debug(f"Cache expired for {endpoint}")
-            except Exception as e:
-                logger.warning(f"Error reading cache for {endpoint}: {str(e)}")
+                    payload, ts, ttl = row
+                    if now - ts < ttl:
+                        data = _loads(payload)
+                        self._mem_put(key, payload, ts + ttl)
+                        with self.lock:
+                            self.db.execute(_TOUCH_SQL, (now, key))
+                    else:
+                        logger.debug(f"Cache expired for {endpoint}")
+            if data is not None:
+                # بررسی تعداد آیتم‌ها در کش
+                if max_results is not None and endpoint.endswith("tweet/advanced_search"):
+                    tweets = data.get('tweets', [])
+                    if len(tweets) < max_results:
+                        logger.debug(f"Cache ignored for {endpoint}: {len(tweets)} items, needed {max_results}")
+                        self.stats['misses'] += 1
+                        return None
+                self.stats['hits'] += 1
+                logger.debug(f"Cache hit for {endpoint}")
+                return data
+        except Exception as e:
+            logger.warning(f"Error reading cache for {endpoint}: {str(e)}")
         self.stats['misses'] += 1
         return None
 
-    def set(self, endpoint: str, params: Optional[Dict[str, Any]], data: Dict[str, Any], max_results: Optional[int] = None) -> bool:
+    def set(self, endpoint: str, params: Optional[Dict[str, Any]], data: Dict[str, Any], max_results: Optional[int] = None,
+            key: Optional[bytes] = None) -> bool:
         """
         Store data in cache.
 
@@ -82,106 +274,184 @@ class TwitterAPICache:
             params: Request parameters
             data: Data to store
             max_results: Requested number of results (for cache key)
+            key: Precomputed key from make_key() (computed from the arguments if None)
 
         Returns:
-            True if stored successfully, False otherwise
+            True if the entry was queued for storage, False otherwise
         """
-        if self.stats['size'] > self.max_cache_size:
-            self._cleanup_old_cache()
-        key = self._get_cache_key(endpoint, params, max_results)
-        cache_path = os.path.join(self.cache_dir, f"{key}.json")
+        if key is None:
+            key = self.make_key(endpoint, params, max_results)
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                cache_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'endpoint': endpoint,
-                    'data': data
-                }
-                json.dump(cache_data, f, ensure_ascii=False)
-            file_size = os.path.getsize(cache_path)
-            self.stats['size'] += file_size
-            if 'files' in self.stats:
-                self.stats['files'] += 1
-            self.stats['size_mb'] = self.stats['size'] / (1024 * 1024)
-            logger.debug(f"Stored cache for {endpoint} (size: {file_size / 1024:.1f} KB)")
-            return True
+            payload = _dumps(data)
         except Exception as e:
             logger.warning(f"Error storing cache for {endpoint}: {str(e)}")
             return False
+        now = time.time()
+        ttl = self._get_ttl_for_endpoint(endpoint)
+        with self._pending_lock:
+            self._pending[key] = (payload, int(now), ttl)
+            self._generation += 1
+            self._missing.pop(key, None)
+        self._mem_put(key, payload, int(now) + ttl)
+        self._write_q.put((key, endpoint, int(now), ttl, payload, now))
+        return True
+
+    def _mem_get(self, key: bytes, now: float) -> Optional[bytes]:
+        with self._mem_lock:
+            entry = self._mem.get(key)
+            if entry is None:
+                return None
+            expires_at, payload, _ = entry
+            if now >= expires_at:
+                del self._mem[key]
+                return None
+            # access time is kept in memory and written to SQLite before eviction
+            entry[2] = now
+            self._mem.move_to_end(key)
+            return payload
+
+    def _mem_put(self, key: bytes, payload: bytes, expires_at: float) -> None:
+        with self._mem_lock:
+            self._mem[key] = [expires_at, payload, time.time()]
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.MEMORY_CACHE_SIZE:
+                self._mem.popitem(last=False)
+
+    def flush(self) -> None:
+        """Block until all queued writes have been persisted."""
+        self._write_q.join()
+
+    def _write_row(self, row: tuple) -> None:
+        key, endpoint, ts, _, payload, _ = row
+        try:
+            if self.stats['size'] > self.max_cache_size:
+                self._cleanup_old_cache()
+            with self.lock:
+                self.db.execute(_SET_SQL, row)
+            self._calculate_cache_stats()
+            logger.debug(f"Stored cache for {endpoint} (size: {len(payload) / 1024:.1f} KB)")
+        except Exception as e:
+            logger.warning(f"Error storing cache for {endpoint}: {str(e)}")
+        finally:
+            with self._pending_lock:
+                pending = self._pending.get(key)
+                # a newer set() for the same key may already be queued
+                if pending is not None and pending[1] == ts and pending[0] is payload:
+                    del self._pending[key]
 
-    def _get_cache_key(self, endpoint: str, params: Optional[Dict[str, Any]], max_results: Optional[int] = None) -> str:
+    def clear(self, endpoint: Optional[str] = None) -> int:
+        """
+        Remove cached entries.
+
+        Args:
+            endpoint: Only remove entries for this endpoint (all entries if None)
+
+        Returns:
+            Number of removed entries
+        """
+        self.flush()
+        with self._mem_lock:
+            self._mem.clear()
+        with self.lock:
+            if endpoint:
+                cursor = self.db.execute("DELETE FROM cache WHERE endpoint = ?", (endpoint,))
+            else:
+                cursor = self.db.execute("DELETE FROM cache")
+        self._calculate_cache_stats()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Persist queued writes, stop the writer thread and close the database connection."""
+        if self._writer.is_alive():
+            self._write_q.put(None)
+            self._writer.join()
+        _open_caches.discard(self)
+        with self.lock:
+            self.db.close()
+
+    def make_key(self, endpoint: str, params: Optional[Dict[str, Any]], max_results: Optional[int] = None) -> bytes:
         """
         Create a unique cache key.
 
+        Callers doing a get() followed by a set() for the same request can
+        compute the key once and pass it to both via ``key=``.
+
         Args:
             endpoint: API endpoint
             params: Request parameters
             max_results: Requested number of results
 
         Returns:
-            Unique cache key
+            Unique cache key (raw 16-byte blake2b digest)
         """
-        params_str = json.dumps(params, sort_keys=True) if params else ""
-        key_parts = [endpoint, params_str]
+        # always blake2b (stdlib), so processes sharing the database agree on keys
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(endpoint.encode())
+        if params:
+            hasher.update(b'\x00')
+            hasher.update(_canonical_params(params))
         if max_results is not None:
-            key_parts.append(str(max_results))
-        key_str = "_".join(key_parts)
-        return hashlib.md5(key_str.encode()).hexdigest()
+            hasher.update(b'\x00')
+            hasher.update(str(max_results).encode())
+        return hasher.digest()
 
     def _get_ttl_for_endpoint(self, endpoint: str) -> int:
-        for key, ttl in self.ttl_mapping.items():
-            if key in endpoint:
-                return ttl
-        return 600
+        ttl = self._ttl_cache.get(endpoint)
+        if ttl is None:
+            ttl = next((v for k, v in self.ttl_mapping.items() if k in endpoint), 600)
+            self._ttl_cache[endpoint] = ttl
+        return ttl
 
     def _calculate_cache_stats(self):
-        total_size = 0
-        file_count = 0
-        for filename in os.listdir(self.cache_dir):
-            if filename.endswith('.json'):
-                file_path = os.path.join(self.cache_dir, filename)
-                try:
-                    file_size = os.path.getsize(file_path)
-                    total_size += file_size
-                    file_count += 1
-                except:
-                    pass
+        with self.lock:
+            total_size, file_count = self.db.execute(_STATS_SQL).fetchone()
         self.stats['size'] = total_size
         self.stats['size_mb'] = total_size / (1024 * 1024)
         self.stats['files'] = file_count
 
     def _cleanup_old_cache(self):
-        files_info = []
-        for filename in os.listdir(self.cache_dir):
-            if not filename.endswith('.json'):
-                continue
-            file_path = os.path.join(self.cache_dir, filename)
-            try:
-                mtime = os.path.getmtime(file_path)
-                size = os.path.getsize(file_path)
-                files_info.append((file_path, mtime, size))
-            except:
-                continue
-        files_info.sort(key=lambda x: x[1])
         target_size = self.max_cache_size * 0.8
-        current_size = self.stats['size']
-        deleted_count = 0
-        for file_path, _, size in files_info:
-            if current_size <= target_size:
-                break
+        to_free = self.stats['size'] - target_size
+        victims = []
+        freed = 0
+        with self._mem_lock:
+            touched = [(atime, key) for key, (_, _, atime) in self._mem.items()]
+        with self.lock:
+            # touch, selection and deletion share a single transaction
+            self.db.execute("BEGIN")
             try:
-                os.remove(file_path)
-                current_size -= size
-                deleted_count += 1
-            except:
-                continue
+                if touched:
+                    self.db.executemany(_TOUCH_SQL, touched)
+                # least recently used first; the cursor is consumed lazily, so only
+                # the rows that are actually evicted are read
+                for key, size in self.db.execute("SELECT key, LENGTH(payload) FROM cache ORDER BY atime"):
+                    if freed >= to_free:
+                        break
+                    victims.append((key,))
+                    freed += size
+                if victims:
+                    self.db.executemany("DELETE FROM cache WHERE key = ?", victims)
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+        deleted_count = len(victims)
         if deleted_count > 0:
-            logger.info(f"Cleaned {deleted_count} old cache files")
-            self._calculate_cache_stats()
+            logger.info(f"Cleaned {deleted_count} old cache entries")
+            # adjust counters in place instead of re-reading cache_stats
+            self.stats['size'] -= freed
+            self.stats['size_mb'] = self.stats['size'] / (1024 * 1024)
+            self.stats['files'] = self.stats.get('files', 0) - deleted_count
         return deleted_count
 
-    def get_stats(self) -> Dict[str, Union[int, float]]:
+    def refresh_stats(self) -> Dict[str, Union[int, float]]:
+        """Persist queued writes, re-read size/count from the database and return get_stats()."""
+        self.flush()
         self._calculate_cache_stats()
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        # counters are kept current by the writer thread and cleanup; no I/O here
         hit_rate = 0
         total_requests = self.stats['hits'] + self.stats['misses']
         if total_requests > 0:
@@ -211,4 +481,4 @@ class TwitterAPICache:
             parts.append(f"{minutes} minutes")
         if seconds > 0 or not parts:
             parts.append(f"{seconds} seconds")
-        return " and ".join(parts)
\ No newline at end of file
+        return " and ".join(parts)
@@ -5,8 +5,11 @@
 امکان مدیریت هزینه، کنترل نرخ درخواست و کش کردن نتایج را فراهم می‌سازد.
 """
 
+import inspect
 import logging
+import threading
 import time
+from contextlib import contextmanager
 from typing import Any, Dict, List, Optional
 from lib.twitter_api import TwitterAPIClient, Tweet
 from lib.twitter_api.middleware.budget import TwitterAPIBudget
@@ -16,6 +19,18 @@ from lib.twitter_api.middleware.rate_limiter import RateLimiter
 logger = logging.getLogger(__name__)
 
 
+def _count_user_ids(params: Optional[Dict[str, Any]]) -> int:
+    """تعداد شناسه‌های کاربر در پارامتر userIds (برای batch_info_by_ids)"""
+    user_count = 1
+    if params and 'userIds' in params:
+        ids = params['userIds']
+        if isinstance(ids, str):
+            user_count = ids.count(',') + 1
+        elif isinstance(ids, list):
+            user_count = len(ids)
+    return user_count
+
+
 class OptimizedTwitterAPIClient:
     """
     نسخه بهینه شده کلاینت TwitterAPI با مدیریت هزینه، کش و کنترل نرخ درخواست
@@ -30,6 +45,23 @@ class OptimizedTwitterAPIClient:
     5. گزارش‌دهی دقیق از مصرف API
     """
 
+    # متدهایی که max_pages/max_results آن‌ها به پیش‌فرض‌های کلاینت محدود می‌شود
+    LIMITED_METHODS = ('search_tweets', 'get_user_tweets', 'get_user_followers', 'get_tweet_replies')
+
+    # جدول تشخیص نوع منبع: اولین زیررشته منطبق برنده است؛ count یا عدد ثابت است یا تابعی از params
+    ENDPOINT_RESOURCES = (
+        ('tweet/advanced_search', 'tweet', 20),
+        ('user/info', 'user', 1),
+        ('user/batch_info_by_ids', 'user', _count_user_ids),
+        ('user/followers', 'follower', 200),
+        ('user/followings', 'follower', 200),
+        ('user/last_tweets', 'tweet', 20),
+        ('tweet/replies', 'tweet', 20),
+        ('tweet/quotes', 'tweet', 20),
+        ('list/tweets', 'tweet', 20),
+    )
+    _DEFAULT_RESOURCE = ('request', 1)
+
     def __init__(
         self,
         api_key: str,
@@ -47,6 +79,9 @@ class OptimizedTwitterAPIClient:
         self.enable_cache = enable_cache
         self.default_max_pages = default_max_pages
         self.default_max_results = default_max_results
+        self._endpoint_resource_cache: Dict[str, tuple] = {}
+        # پرچم رد کردن کش (خواندن) برای درخواست‌های نخ جاری؛ با bypass_cache تنظیم می‌شود
+        self._local = threading.local()
         self.client = TwitterAPIClient(api_key)
         self._wrap_base_make_request()
         self._wrap_client_methods()
@@ -56,9 +91,9 @@ class OptimizedTwitterAPIClient:
         original_make_request = self.client.base.make_request
 
         def optimized_make_request(method, endpoint, params=None, data=None, headers=None, timeout=None, **kwargs):
-            skip_cache = kwargs.get('skip_cache', False)
+            skip_cache = kwargs.get('skip_cache', False) or getattr(self._local, 'skip_cache', False)
             resource_type, resource_count = self._estimate_resource_info(endpoint, params)
-            start_time = time.time()
+            start_time = time.monotonic()
             short_endpoint = endpoint.split('/')[-1] if '/' in endpoint else endpoint
             logger.debug(f"Request to {short_endpoint} ({resource_type}, count: {resource_count})")
 
@@ -72,9 +107,15 @@ class OptimizedTwitterAPIClient:
                 logger.error(error_msg)
                 raise Exception(error_msg)
 
-            if self.enable_cache and method.upper() == 'GET' and not skip_cache:
+            use_cache = self.enable_cache and method.upper() == 'GET'
+            cache_key = None
+            if use_cache:
                 max_results = kwargs.get('max_results') or params.get('max_results') if params else None
-                cache_data = self.cache.get(endpoint, params, max_results)
+                # کلید کش یک بار محاسبه و برای get و set استفاده می‌شود
+                cache_key = self.cache.make_key(endpoint, params, max_results)
+
+            if use_cache and not skip_cache:
+                cache_data = self.cache.get(endpoint, params, max_results, key=cache_key)
                 if cache_data:
                     logger.info(f"Retrieved cache for {short_endpoint}")
                     return cache_data
@@ -86,12 +127,11 @@ class OptimizedTwitterAPIClient:
             try:
                 self.budget.record_usage(endpoint, resource_type, resource_count)
                 response = original_make_request(method, endpoint, params, data, headers, timeout)
-                response_time = time.time() - start_time
+                response_time = time.monotonic() - start_time
                 logger.info(f"Response from {short_endpoint}. Time: {response_time:.2f}s, cost: {estimated_cost} credits")
 
-                if self.enable_cache and method.upper() == 'GET':
-                    max_results = kwargs.get('max_results') or params.get('max_results') if params else None
-                    self.cache.set(endpoint, params, response, max_results)
+                if use_cache:
+                    self.cache.set(endpoint, params, response, max_results, key=cache_key)
 
                 return response
             except Exception as e:
@@ -102,164 +142,67 @@ class OptimizedTwitterAPIClient:
         self.client.base.make_request = optimized_make_request
 
     def _wrap_client_methods(self):
-        original_search_tweets = self.client.search_tweets
-
-        def limited_search_tweets(query, query_type="Latest", cursor=None, max_pages=None, max_results=None, convert_to_models=True):
-            # محاسبه تعداد صفحات بر اساس max_results
-            if max_results is not None:
-                estimated_pages = max(1, (max_results + 19) // 20)  # فرض 20 توییت در صفحه
-                max_pages = max_pages or estimated_pages
-                if max_pages < estimated_pages:
-                    logger.warning(f"max_pages ({max_pages}) may be insufficient for max_results ({max_results})")
-            else:
-                max_pages = max_pages or self.default_max_pages
-
-            max_results = max_results or self.default_max_results
-            logger.debug(f"Settings: max_pages={max_pages}, max_results={max_results}")
-
-            return original_search_tweets(
-                query=query,
-                query_type=query_type,
-                cursor=cursor,
-                max_pages=max_pages,
-                max_results=max_results,
-                convert_to_models=convert_to_models
-            )
-
-        self.client.search_tweets = limited_search_tweets
-
-        def limited_search_tweets(query, query_type="Latest", cursor=None,
-                                  max_pages=None, max_results=None, convert_to_models=True):
-            """نسخه محدود شده search_tweets"""
-            # اعمال محدودیت‌های پیش‌فرض
-            if max_pages is None or max_pages > self.default_max_pages:
-                max_pages = self.default_max_pages
-                logger.debug(f"محدودیت max_pages به {max_pages} تنظیم شد (کنترل هزینه)")
-
-            if max_results is None or max_results > self.default_max_results:
-                max_results = self.default_max_results
-                logger.debug(f"محدودیت max_results به {max_results} تنظیم شد (کنترل هزینه)")
-
-            # اجرای متد اصلی با محدودیت‌های اعمال شده
-            return original_search_tweets(
-                query=query,
-                query_type=query_type,
-                cursor=cursor,
-                max_pages=max_pages,
-                max_results=max_results,
-                convert_to_models=convert_to_models
-            )
-
-        # 2. محدودسازی دریافت توییت‌های کاربر
-        original_get_user_tweets = self.client.get_user_tweets
-
-        def limited_get_user_tweets(username=None, user_id=None, cursor=None,
-                                    max_pages=None, max_results=None, convert_to_models=True):
-            """نسخه محدود شده get_user_tweets"""
-            # اعمال محدودیت‌های پیش‌فرض
-            if max_pages is None or max_pages > self.default_max_pages:
-                max_pages = self.default_max_pages
-                logger.debug(f"محدودیت max_pages به {max_pages} تنظیم شد (کنترل هزینه)")
+        # جایگزینی متدهای صفحه‌بندی‌شده با نسخه‌های محدود شده (کنترل هزینه)
+        for name in self.LIMITED_METHODS:
+            setattr(self.client, name, self._make_limited(getattr(self.client, name), name))
+
+    def _make_limited(self, original, name: str):
+        """ساخت نسخه محدود شده یک متد: max_pages و max_results به پیش‌فرض‌ها محدود می‌شوند"""
+        signature = inspect.signature(original)
+
+        def limited(*args, skip_cache: bool = False, **kwargs):
+            if skip_cache:
+                with self.bypass_cache():
+                    return limited(*args, **kwargs)
+            # آرگومان‌ها با امضای متد اصلی بسته می‌شوند تا max_pages/max_results موقعیتی هم محدود شوند
+            bound = signature.bind_partial(*args, **kwargs)
+            max_pages = bound.arguments.get('max_pages')
+            max_results = bound.arguments.get('max_results')
 
-            if max_results is None or max_results > self.default_max_results:
-                max_results = self.default_max_results
-                logger.debug(f"محدودیت max_results به {max_results} تنظیم شد (کنترل هزینه)")
-
-            # اجرای متد اصلی با محدودیت‌های اعمال شده
-            return original_get_user_tweets(
-                username=username,
-                user_id=user_id,
-                cursor=cursor,
-                max_pages=max_pages,
-                max_results=max_results,
-                convert_to_models=convert_to_models
-            )
-
-        # 3. محدودسازی دریافت دنبال‌کنندگان کاربر
-        original_get_user_followers = self.client.get_user_followers
-
-        def limited_get_user_followers(username, cursor=None, max_pages=None,
-                                       max_results=None, convert_to_models=True):
-            """نسخه محدود شده get_user_followers"""
             # اعمال محدودیت‌های پیش‌فرض
             if max_pages is None or max_pages > self.default_max_pages:
                 max_pages = self.default_max_pages
-                logger.debug(f"محدودیت max_pages به {max_pages} تنظیم شد (کنترل هزینه)")
+                logger.debug(f"{name}: محدودیت max_pages به {max_pages} تنظیم شد (کنترل هزینه)")
 
             if max_results is None or max_results > self.default_max_results:
                 max_results = self.default_max_results
-                logger.debug(f"محدودیت max_results به {max_results} تنظیم شد (کنترل هزینه)")
+                logger.debug(f"{name}: محدودیت max_results به {max_results} تنظیم شد (کنترل هزینه)")
 
             # اجرای متد اصلی با محدودیت‌های اعمال شده
-            return original_get_user_followers(
-                username=username,
-                cursor=cursor,
-                max_pages=max_pages,
-                max_results=max_results,
-                convert_to_models=convert_to_models
-            )
+            bound.arguments['max_pages'] = max_pages
+            bound.arguments['max_results'] = max_results
+            return original(*bound.args, **bound.kwargs)
 
-        # 4. محدودسازی دریافت پاسخ‌های توییت
-        original_get_tweet_replies = self.client.get_tweet_replies
-
-        def limited_get_tweet_replies(tweet_id, since_time=None, until_time=None,
-                                      cursor=None, max_pages=None, max_results=None,
-                                      convert_to_models=True):
-            """نسخه محدود شده get_tweet_replies"""
-            # اعمال محدودیت‌های پیش‌فرض
-            if max_pages is None or max_pages > self.default_max_pages:
-                max_pages = self.default_max_pages
-                logger.debug(f"محدودیت max_pages به {max_pages} تنظیم شد (کنترل هزینه)")
-
-            if max_results is None or max_results > self.default_max_results:
-                max_results = self.default_max_results
-                logger.debug(f"محدودیت max_results به {max_results} تنظیم شد (کنترل هزینه)")
-
-            # اجرای متد اصلی با محدودیت‌های اعمال شده
-            return original_get_tweet_replies(
-                tweet_id=tweet_id,
-                since_time=since_time,
-                until_time=until_time,
-                cursor=cursor,
-                max_pages=max_pages,
-                max_results=max_results,
-                convert_to_models=convert_to_models
-            )
-
-        # جایگزینی متدهای اصلی با نسخه‌های محدود شده
-        self.client.search_tweets = limited_search_tweets
-        self.client.get_user_tweets = limited_get_user_tweets
-        self.client.get_user_followers = limited_get_user_followers
-        self.client.get_tweet_replies = limited_get_tweet_replies
-
-        # همین الگو برای سایر متدها نیز تکرار می‌شود...
+        limited.__name__ = name
+        limited.__doc__ = f"نسخه محدود شده {name}"
+        return limited
 
     def _estimate_resource_info(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> tuple[str, int]:
-        if 'tweet/advanced_search' in endpoint:
-            return 'tweet', 20
-        elif 'user/info' in endpoint:
-            return 'user', 1
-        elif 'user/batch_info_by_ids' in endpoint:
-            user_count = 1
-            if params and 'userIds' in params:
-                ids = params['userIds']
-                if isinstance(ids, str):
-                    user_count = len(ids.split(','))
-                elif isinstance(ids, list):
-                    user_count = len(ids)
-            return 'user', user_count
-        elif 'user/followers' in endpoint or 'user/followings' in endpoint:
-            return 'follower', 200
-        elif 'user/last_tweets' in endpoint:
-            return 'tweet', 20
-        elif 'tweet/replies' in endpoint:
-            return 'tweet', 20
-        elif 'tweet/quotes' in endpoint:
-            return 'tweet', 20
-        elif 'list/tweets' in endpoint:
-            return 'tweet', 20
-        else:
-            return 'request', 1
+        entry = self._endpoint_resource_cache.get(endpoint)
+        if entry is None:
+            entry = next(
+                ((resource_type, count) for key, resource_type, count in self.ENDPOINT_RESOURCES if key in endpoint),
+                self._DEFAULT_RESOURCE
+            )
+            self._endpoint_resource_cache[endpoint] = entry
+        resource_type, count = entry
+        if isinstance(count, int):
+            return resource_type, count
+        return resource_type, count(params)
+
+    @contextmanager
+    def bypass_cache(self):
+        """
+        درخواست‌های این نخ در داخل بلوک از کش خوانده نمی‌شوند (پاسخ‌ها همچنان ذخیره می‌شوند)
+
+        برای داده‌های غیر ایدمپوتنت مانند جستجوی Latest؛ ایتریتورها باید داخل بلوک مصرف شوند.
+        """
+        previous = getattr(self._local, 'skip_cache', False)
+        self._local.skip_cache = True
+        try:
+            yield
+        finally:
+            self._local.skip_cache = previous
 
     def get_budget_status(self) -> Dict[str, Any]:
         return self.budget.get_status()
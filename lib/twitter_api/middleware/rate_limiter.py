@@ -8,7 +8,8 @@
 import logging
 import time
 import threading
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -35,8 +36,8 @@ class RateLimiter:
         self.max_per_minute = max_per_minute
         self.min_delay = min_delay
         self.adaptive_delay = adaptive_delay
-        self.requests = []  # زمان درخواست‌های اخیر
-        self.last_request_time = None  # زمان آخرین درخواست
+        self.requests = deque()  # زمان درخواست‌های اخیر (time.monotonic)
+        self.last_request_time = None  # زمان آخرین درخواست (time.monotonic)
         self.lock = threading.Lock()
 
         logger.info(
@@ -59,17 +60,20 @@ class RateLimiter:
         Returns:
             زمان واقعی انتظار (ثانیه)
         """
+        # محاسبه تأخیر مورد نیاز (شامل خواندن وضعیت بودجه) خارج از قفل
+        required_delay = self._calculate_delay(estimated_cost)
+
         with self.lock:
-            now = datetime.now()
+            now = time.monotonic()
             wait_time = 0
 
-            # حذف درخواست‌های قدیمی تر از 1 دقیقه
-            self.requests = [t for t in self.requests if now - t < timedelta(minutes=1)]
+            # حذف درخواست‌های قدیمی تر از 1 دقیقه (فقط از ابتدای صف)
+            self._expire_old_requests(now)
 
             # بررسی محدودیت تعداد درخواست در دقیقه
+            # (صف ممکن است زمان‌های زمان‌بندی‌شده آینده هم داشته باشد)
             if len(self.requests) >= self.max_per_minute:
-                oldest = self.requests[0]
-                wait_time_rate_limit = (oldest + timedelta(minutes=1) - now).total_seconds()
+                wait_time_rate_limit = self.requests[-self.max_per_minute] + 60 - now
 
                 if wait_time_rate_limit > 0:
                     wait_time = max(wait_time, wait_time_rate_limit)
@@ -79,27 +83,31 @@ class RateLimiter:
                     )
 
             # بررسی تأخیر حداقل بین درخواست‌ها
-            if self.last_request_time:
-                time_since_last = (now - self.last_request_time).total_seconds()
-
-                # محاسبه تأخیر مورد نیاز
-                required_delay = self._calculate_delay(estimated_cost)
+            if self.last_request_time is not None:
+                time_since_last = now - self.last_request_time
 
                 if time_since_last < required_delay:
                     delay_time = required_delay - time_since_last
                     wait_time = max(wait_time, delay_time)
 
-            # اعمال تأخیر اگر لازم است
-            if wait_time > 0:
-                if endpoint:
-                    logger.debug(f"انتظار {wait_time:.2f} ثانیه قبل از درخواست به {endpoint}")
-                time.sleep(wait_time)
+            # ثبت زمان پیش‌بینی‌شده درخواست (پس از انتظار) تا درخواست‌های
+            # هم‌زمان دیگر بدون منتظر ماندن برای این قفل نوبت خود را محاسبه کنند
+            self.last_request_time = now + wait_time
+            self.requests.append(self.last_request_time)
 
-            # ثبت درخواست جدید
-            self.requests.append(datetime.now())
-            self.last_request_time = datetime.now()
+        # اعمال تأخیر خارج از قفل
+        if wait_time > 0:
+            if endpoint:
+                logger.debug(f"انتظار {wait_time:.2f} ثانیه قبل از درخواست به {endpoint}")
+            time.sleep(wait_time)
 
-            return wait_time
+        return wait_time
+
+    def _expire_old_requests(self, now: float) -> None:
+        """حذف زمان‌های خارج از پنجره یک‌دقیقه‌ای از ابتدای صف"""
+        requests = self.requests
+        while requests and requests[0] <= now - 60:
+            requests.popleft()
 
     def _calculate_delay(self, estimated_cost: Optional[float] = None) -> float:
         """
@@ -163,16 +171,21 @@ class RateLimiter:
             دیکشنری حاوی آمار
         """
         with self.lock:
-            now = datetime.now()
-            self.requests = [t for t in self.requests if now - t < timedelta(minutes=1)]
+            now = time.monotonic()
+            self._expire_old_requests(now)
 
             # محاسبه سرعت میانگین درخواست‌ها
             avg_rate = 0
             if len(self.requests) >= 2:
-                time_span = (self.requests[-1] - self.requests[0]).total_seconds()
+                time_span = self.requests[-1] - self.requests[0]
                 if time_span > 0:
                     avg_rate = (len(self.requests) - 1) / time_span
 
+            last_request = None
+            if self.last_request_time is not None:
+                # تبدیل زمان monotonic به زمان دیواری فقط برای نمایش
+                last_request = datetime.fromtimestamp(time.time() - (now - self.last_request_time)).isoformat()
+
             return {
                 'current_minute_requests': len(self.requests),
                 'max_per_minute': self.max_per_minute,
@@ -180,5 +193,5 @@ class RateLimiter:
                 'min_delay': self.min_delay,
                 'adaptive_delay': self.adaptive_delay,
                 'avg_requests_per_second': avg_rate,
-                'last_request': self.last_request_time.isoformat() if self.last_request_time else None
+                'last_request': last_request
             }
\ No newline at end of file
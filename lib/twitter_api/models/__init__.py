@@ -4,12 +4,13 @@ Data models for TwitterAPI.io client.
 مدل‌های داده برای کلاینت TwitterAPI.io
 """
 
-from lib.twitter_api.models.tweet import Tweet, Entity, HashtagEntity, UrlEntity, UserMentionEntity
+from lib.twitter_api.models.tweet import Tweet, TweetBatch, Entity, HashtagEntity, UrlEntity, UserMentionEntity
 from lib.twitter_api.models.user import User
 from lib.twitter_api.models.webhook import WebhookRule
 
 __all__ = [
     "Tweet",
+    "TweetBatch",
     "Entity",
     "HashtagEntity",
     "UrlEntity",
@@ -4,26 +4,32 @@ Tweet models for TwitterAPI.io client.
 مدل‌های توییت برای کلاینت TwitterAPI.io
 """
 
+import collections.abc
 import dataclasses
 import datetime
-from typing import Any, Dict, List, Optional, Union
+from array import array
+from typing import Any, ClassVar, Dict, Iterable, List, Mapping, Optional, Union
 
+from lib.twitter_api.utils.codegen import ALWAYS, NOT_NONE, TRUTHY, compile_to_dict
 from lib.twitter_api.utils.date_utils import parse_twitter_date
 
+_UTC = datetime.timezone.utc
+_NOW = datetime.datetime.now
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(slots=True)
 class Entity:
     """Base class for Twitter entities."""
     indices: List[int]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class HashtagEntity(Entity):
     """Model for hashtag entity in tweets."""
     text: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UrlEntity(Entity):
     """Model for URL entity in tweets."""
     url: str
@@ -31,7 +37,7 @@ class UrlEntity(Entity):
     expanded_url: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UserMentionEntity(Entity):
     """Model for user mention entity in tweets."""
     id_str: str
@@ -39,7 +45,62 @@ class UserMentionEntity(Entity):
     screen_name: str
 
 
-@dataclasses.dataclass
+def _as_int(value: Any, default: Optional[int] = 0) -> Optional[int]:
+    """Coerce an API count to int; ints (the common case) are returned as-is."""
+    if type(value) is int:
+        return value
+    if value is None:
+        return default
+    return int(value)
+
+
+# Defaults merged under the API dict in Tweet.from_dict (values present in data win)
+_TWEET_DEFAULTS = {
+    "id": None, "text": "", "createdAt": None,
+    "retweetCount": None, "replyCount": None, "likeCount": None, "quoteCount": None,
+    "viewCount": None, "bookmarkCount": None,
+    "isReply": False, "inReplyToId": None, "conversationId": None,
+    "inReplyToUserId": None, "inReplyToUsername": None,
+    "url": None, "twitterUrl": None, "source": None, "lang": None,
+    "extendedEntities": None, "card": None, "place": None,
+    "entities": None,
+}
+
+# Keys of nested tweets linked by Tweet.from_dict
+_NESTED_TWEET_KEYS = ("quoted_tweet", "retweeted_tweet")
+
+# (key, condition, expression) for Tweet.to_dict; $v is self.<key>
+_TWEET_TO_DICT_SPEC = (
+    ("type", ALWAYS, "$v"),
+    ("id", ALWAYS, "$v"),
+    ("text", ALWAYS, "$v"),
+    ("created_at", ALWAYS, "$v.isoformat()"),
+    ("retweet_count", ALWAYS, "$v"),
+    ("reply_count", ALWAYS, "$v"),
+    ("like_count", ALWAYS, "$v"),
+    ("quote_count", ALWAYS, "$v"),
+    ("view_count", NOT_NONE, "$v"),
+    ("bookmark_count", NOT_NONE, "$v"),
+    ("url", TRUTHY, "$v"),
+    ("twitter_url", TRUTHY, "$v"),
+    ("source", TRUTHY, "$v"),
+    ("lang", TRUTHY, "$v"),
+    ("is_reply", ALWAYS, "$v"),
+    ("in_reply_to_id", TRUTHY, "$v"),
+    ("conversation_id", TRUTHY, "$v"),
+    ("in_reply_to_user_id", TRUTHY, "$v"),
+    ("in_reply_to_username", TRUTHY, "$v"),
+    ("author", TRUTHY, "$v.to_dict()"),
+    ("quoted_tweet", TRUTHY, "$v.to_dict()"),
+    ("retweeted_tweet", TRUTHY, "$v.to_dict()"),
+    ("entities", ALWAYS, "self._entities_dict()"),
+    ("extended_entities", TRUTHY, "$v"),
+    ("card", TRUTHY, "$v"),
+    ("place", TRUTHY, "$v"),
+)
+
+
+@dataclasses.dataclass(slots=True)
 class Tweet:
     """
     Model for Twitter tweet data.
@@ -60,8 +121,8 @@ class Tweet:
     view_count: Optional[int] = None
     bookmark_count: Optional[int] = None
 
-    # API type field (must be after non-default arguments)
-    type: str = "tweet"  # مقدار ثابت طبق مستندات API
+    # API type field (constant per class; not an instance field)
+    type: ClassVar[str] = "tweet"  # مقدار ثابت طبق مستندات API
 
     # Tweet metadata
     url: Optional[str] = None
@@ -79,11 +140,6 @@ class Tweet:
     quoted_tweet: Optional['Tweet'] = None
     retweeted_tweet: Optional['Tweet'] = None
 
-    # Entities
-    hashtags: List[HashtagEntity] = dataclasses.field(default_factory=list)
-    urls: List[UrlEntity] = dataclasses.field(default_factory=list)
-    user_mentions: List[UserMentionEntity] = dataclasses.field(default_factory=list)
-
     # Additional fields found in real API
     extended_entities: Optional[Dict[str, Any]] = None
     card: Optional[Dict[str, Any]] = None
@@ -92,8 +148,115 @@ class Tweet:
     # Raw data
     raw_data: Optional[Dict[str, Any]] = None
 
+    # Class-level switch (User has the same one): set Tweet._keep_raw = False
+    # for bulk ingest to drop the source dict (raw_data stays None) and
+    # roughly halve memory per object
+    _keep_raw = True
+
+    # Entities: the API's raw "entities" dict is kept as-is; hashtags/urls/
+    # user_mentions objects are only built on first access (see properties)
+    _raw_entities: Optional[Mapping[str, Any]] = dataclasses.field(default=None, repr=False)
+    _hashtags: Optional[List[HashtagEntity]] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False)
+    _urls: Optional[List[UrlEntity]] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False)
+    _user_mentions: Optional[List[UserMentionEntity]] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False)
+
+    @property
+    def hashtags(self) -> List[HashtagEntity]:
+        """Hashtag entities (built from the raw entities on first access)."""
+        if self._hashtags is None:
+            self._hashtags = [
+                HashtagEntity(
+                    indices=hashtag_data.get("indices", [0, 0]),
+                    text=hashtag_data.get("text", "")
+                )
+                for hashtag_data in self._raw_entity_list("hashtags")
+            ]
+        return self._hashtags
+
+    @hashtags.setter
+    def hashtags(self, value: List[HashtagEntity]) -> None:
+        self._hashtags = value
+
+    @property
+    def urls(self) -> List[UrlEntity]:
+        """URL entities (built from the raw entities on first access)."""
+        if self._urls is None:
+            self._urls = [
+                UrlEntity(
+                    indices=url_data.get("indices", [0, 0]),
+                    url=url_data.get("url", ""),
+                    display_url=url_data.get("display_url", ""),
+                    expanded_url=url_data.get("expanded_url", "")
+                )
+                for url_data in self._raw_entity_list("urls")
+            ]
+        return self._urls
+
+    @urls.setter
+    def urls(self, value: List[UrlEntity]) -> None:
+        self._urls = value
+
+    @property
+    def user_mentions(self) -> List[UserMentionEntity]:
+        """User mention entities (built from the raw entities on first access)."""
+        if self._user_mentions is None:
+            self._user_mentions = [
+                UserMentionEntity(
+                    indices=mention_data.get("indices", [0, 0]),
+                    id_str=mention_data.get("id_str", ""),
+                    name=mention_data.get("name", ""),
+                    screen_name=mention_data.get("screen_name", "")
+                )
+                for mention_data in self._raw_entity_list("user_mentions")
+            ]
+        return self._user_mentions
+
+    @user_mentions.setter
+    def user_mentions(self, value: List[UserMentionEntity]) -> None:
+        self._user_mentions = value
+
+    def _raw_entity_list(self, kind: str) -> List[Dict[str, Any]]:
+        """Raw entity dicts of one kind ("hashtags", "urls", "user_mentions")."""
+        if not self._raw_entities:
+            return []
+        return self._raw_entities.get(kind) or []
+
+    def _entities_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Entities section of to_dict.
+
+        Entity kinds that were never accessed are serialized straight from the
+        raw dicts, without building the Entity objects first.
+        """
+        if self._hashtags is None:
+            hashtags = [{"indices": h.get("indices", [0, 0]), "text": h.get("text", "")}
+                        for h in self._raw_entity_list("hashtags")]
+        else:
+            hashtags = [{"indices": h.indices, "text": h.text} for h in self._hashtags]
+
+        if self._urls is None:
+            urls = [{"indices": u.get("indices", [0, 0]), "url": u.get("url", ""),
+                     "display_url": u.get("display_url", ""), "expanded_url": u.get("expanded_url", "")}
+                    for u in self._raw_entity_list("urls")]
+        else:
+            urls = [{"indices": u.indices, "url": u.url, "display_url": u.display_url,
+                     "expanded_url": u.expanded_url} for u in self._urls]
+
+        if self._user_mentions is None:
+            user_mentions = [{"indices": m.get("indices", [0, 0]), "id_str": m.get("id_str", ""),
+                              "name": m.get("name", ""), "screen_name": m.get("screen_name", "")}
+                             for m in self._raw_entity_list("user_mentions")]
+        else:
+            user_mentions = [{"indices": m.indices, "id_str": m.id_str, "name": m.name,
+                              "screen_name": m.screen_name} for m in self._user_mentions]
+
+        return {"hashtags": hashtags, "urls": urls, "user_mentions": user_mentions}
+
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Tweet':
+    def from_dict(cls, data: Dict[str, Any], now: Optional[datetime.datetime] = None) -> 'Tweet':
         """
         Create Tweet object from dictionary.
 
@@ -102,95 +265,72 @@ class Tweet:
 
         Args:
             data: Dictionary containing tweet data from TwitterAPI.io
+            now: Fallback created_at for missing/invalid dates; batch callers
+                pass one value so it isn't recomputed per tweet
 
         Returns:
             Tweet object
         """
+        # Nested quoted/retweeted tweets are built with an explicit worklist
+        # instead of recursion: each node is parsed shallowly, then linked.
+        root = cls._from_dict_shallow(data, now)
+        stack = [(root, data)]
+        while stack:
+            tweet, tweet_data = stack.pop()
+            for slot in _NESTED_TWEET_KEYS:
+                nested_data = tweet_data.get(slot)
+                if nested_data:
+                    nested = cls._from_dict_shallow(nested_data, now)
+                    setattr(tweet, slot, nested)
+                    stack.append((nested, nested_data))
+        return root
+
+    @classmethod
+    def _from_dict_shallow(cls, data: Dict[str, Any], now: Optional[datetime.datetime] = None) -> 'Tweet':
+        """Create a Tweet from a dictionary without its quoted/retweeted tweets."""
+        # Merge defaults once (C-level) so every key below is present
+        d = _TWEET_DEFAULTS | data
+
         # Handle different tweet types/fields
-        tweet_id = data.get("id")
-        text = data.get("text", "")
+        tweet_id = d["id"]
+        text = d["text"]
 
         # Parse created_at
-        created_at_str = data.get("createdAt")
+        created_at_str = d["createdAt"]
+        created_at = None
         if created_at_str:
             try:
                 created_at = parse_twitter_date(created_at_str)
             except (ValueError, TypeError):
-                created_at = datetime.datetime.now(tz=datetime.timezone.utc)
-        else:
-            created_at = datetime.datetime.now(tz=datetime.timezone.utc)
+                pass
+        if created_at is None:
+            created_at = now or _NOW(tz=_UTC)
 
         # Parse stats (with fallbacks to 0)
-        retweet_count = int(data.get("retweetCount", 0))
-        reply_count = int(data.get("replyCount", 0))
-        like_count = int(data.get("likeCount", 0))
-        quote_count = int(data.get("quoteCount", 0))
+        retweet_count = _as_int(d["retweetCount"])
+        reply_count = _as_int(d["replyCount"])
+        like_count = _as_int(d["likeCount"])
+        quote_count = _as_int(d["quoteCount"])
 
         # Optional stats
-        view_count = None
-        if "viewCount" in data:
-            view_count = int(data.get("viewCount", 0))
-
-        bookmark_count = None
-        if "bookmarkCount" in data:
-            bookmark_count = int(data.get("bookmarkCount", 0))
+        view_count = _as_int(d["viewCount"], None)
+        bookmark_count = _as_int(d["bookmarkCount"], None)
 
         # Parse flags and relationships
-        is_reply = data.get("isReply", False)
-        in_reply_to_id = data.get("inReplyToId")
-        conversation_id = data.get("conversationId")
-        in_reply_to_user_id = data.get("inReplyToUserId")
-        in_reply_to_username = data.get("inReplyToUsername")
+        is_reply = d["isReply"]
+        in_reply_to_id = d["inReplyToId"]
+        conversation_id = d["conversationId"]
+        in_reply_to_user_id = d["inReplyToUserId"]
+        in_reply_to_username = d["inReplyToUsername"]
 
         # URLs - API has both url and twitterUrl fields
-        url = data.get("url")
-        twitter_url = data.get("twitterUrl")
+        url = d["url"]
+        twitter_url = d["twitterUrl"]
 
         # Additional fields found in real API
-        extended_entities = data.get("extendedEntities")
-        card = data.get("card")
-        place = data.get("place")
-
-        # Prepare entities
-        hashtags = []
-        urls = []
-        user_mentions = []
-
-        entities = data.get("entities", {})
-
-        # Parse hashtags
-        for hashtag_data in entities.get("hashtags", []):
-            hashtags.append(HashtagEntity(
-                indices=hashtag_data.get("indices", [0, 0]),
-                text=hashtag_data.get("text", "")
-            ))
-
-        # Parse URLs
-        for url_data in entities.get("urls", []):
-            urls.append(UrlEntity(
-                indices=url_data.get("indices", [0, 0]),
-                url=url_data.get("url", ""),
-                display_url=url_data.get("display_url", ""),
-                expanded_url=url_data.get("expanded_url", "")
-            ))
-
-        # Parse user mentions
-        for mention_data in entities.get("user_mentions", []):
-            user_mentions.append(UserMentionEntity(
-                indices=mention_data.get("indices", [0, 0]),
-                id_str=mention_data.get("id_str", ""),
-                name=mention_data.get("name", ""),
-                screen_name=mention_data.get("screen_name", "")
-            ))
-
-        # Parse nested tweets
-        quoted_tweet = None
-        if "quoted_tweet" in data and data["quoted_tweet"]:
-            quoted_tweet = cls.from_dict(data["quoted_tweet"])
-
-        retweeted_tweet = None
-        if "retweeted_tweet" in data and data["retweeted_tweet"]:
-            retweeted_tweet = cls.from_dict(data["retweeted_tweet"])
+        extended_entities = d["extendedEntities"]
+        card = d["card"]
+        place = d["place"]
 
         # Create Tweet object
         return cls(
@@ -205,97 +345,86 @@ class Tweet:
             bookmark_count=bookmark_count,
             url=url,
             twitter_url=twitter_url,
-            source=data.get("source"),
-            lang=data.get("lang"),
+            source=d["source"],
+            lang=d["lang"],
             is_reply=is_reply,
             in_reply_to_id=in_reply_to_id,
             conversation_id=conversation_id,
             in_reply_to_user_id=in_reply_to_user_id,
             in_reply_to_username=in_reply_to_username,
             author=None,  # Will be set separately
-            quoted_tweet=quoted_tweet,
-            retweeted_tweet=retweeted_tweet,
-            hashtags=hashtags,
-            urls=urls,
-            user_mentions=user_mentions,
+            quoted_tweet=None,  # Linked by from_dict
+            retweeted_tweet=None,
             extended_entities=extended_entities,
             card=card,
             place=place,
-            raw_data=data
+            raw_data=data if cls._keep_raw else None,
+            _raw_entities=d["entities"]
         )
 
-    def to_dict(self) -> Dict[str, Any]:
+    @classmethod
+    def from_list(cls, items: List[Dict[str, Any]]) -> List['Tweet']:
         """
-        Convert Tweet object to dictionary.
+        Create Tweet objects from a list of dictionaries (one API page).
+
+        Args:
+            items: List of tweet dictionaries from TwitterAPI.io
 
         Returns:
-            Dictionary representation of the tweet
+            List of Tweet objects
         """
-        result = {
-            "type": self.type,
-            "id": self.id,
-            "text": self.text,
-            "created_at": self.created_at.isoformat(),
-            "retweet_count": self.retweet_count,
-            "reply_count": self.reply_count,
-            "like_count": self.like_count,
-            "quote_count": self.quote_count,
-        }
-
-        if self.view_count is not None:
-            result["view_count"] = self.view_count
-
-        if self.bookmark_count is not None:
-            result["bookmark_count"] = self.bookmark_count
-
-        if self.url:
-            result["url"] = self.url
-
-        if self.twitter_url:
-            result["twitter_url"] = self.twitter_url
-
-        if self.source:
-            result["source"] = self.source
-
-        if self.lang:
-            result["lang"] = self.lang
-
-        result["is_reply"] = self.is_reply
+        from_dict = cls.from_dict
+        now = _NOW(tz=_UTC)  # one fallback timestamp per page
+        return [from_dict(item, now) for item in items]
 
-        if self.in_reply_to_id:
-            result["in_reply_to_id"] = self.in_reply_to_id
+    # Convert Tweet object to dictionary; generated once from _TWEET_TO_DICT_SPEC
+    to_dict = compile_to_dict("Tweet.to_dict", _TWEET_TO_DICT_SPEC)
 
-        if self.conversation_id:
-            result["conversation_id"] = self.conversation_id
 
-        if self.in_reply_to_user_id:
-            result["in_reply_to_user_id"] = self.in_reply_to_user_id
-
-        if self.in_reply_to_username:
-            result["in_reply_to_username"] = self.in_reply_to_username
-
-        if self.author:
-            result["author"] = self.author.to_dict()
-
-        if self.quoted_tweet:
-            result["quoted_tweet"] = self.quoted_tweet.to_dict()
-
-        if self.retweeted_tweet:
-            result["retweeted_tweet"] = self.retweeted_tweet.to_dict()
-
-        result["entities"] = {
-            "hashtags": [{"indices": h.indices, "text": h.text} for h in self.hashtags],
-            "urls": [{"indices": u.indices, "url": u.url, "display_url": u.display_url, "expanded_url": u.expanded_url} for u in self.urls],
-            "user_mentions": [{"indices": m.indices, "id_str": m.id_str, "name": m.name, "screen_name": m.screen_name} for m in self.user_mentions],
-        }
-
-        if self.extended_entities:
-            result["extended_entities"] = self.extended_entities
-
-        if self.card:
-            result["card"] = self.card
+class TweetBatch(collections.abc.Sequence):
+    """
+    Column-oriented view over a page of tweet dictionaries.
 
-        if self.place:
-            result["place"] = self.place
+    Numeric stats are extracted once into compact ``array('q')`` columns so
+    aggregations (sums, top-N by likes, ...) don't need a Tweet object per
+    item; full Tweet objects (with author) are built lazily on indexing and
+    then reused.
 
-        return result
\ No newline at end of file
+    ستون‌های عددی یک بار استخراج می‌شوند و اشیای Tweet فقط هنگام دسترسی ساخته می‌شوند.
+    """
+    __slots__ = ("_items", "_tweets", "ids", "retweet_counts", "reply_counts",
+                 "like_counts", "quote_counts", "view_counts")
+
+    # value stored in view_counts when the API did not report views
+    MISSING = -1
+
+    def __init__(self, items: Iterable[Dict[str, Any]]):
+        self._items = list(items)
+        self._tweets: List[Optional[Tweet]] = [None] * len(self._items)
+        self.ids = [item.get("id") for item in self._items]
+        self.retweet_counts = self._column("retweetCount", 0)
+        self.reply_counts = self._column("replyCount", 0)
+        self.like_counts = self._column("likeCount", 0)
+        self.quote_counts = self._column("quoteCount", 0)
+        self.view_counts = self._column("viewCount", self.MISSING)
+
+    def _column(self, key: str, default: int) -> array:
+        return array("q", [_as_int(item.get(key), default) for item in self._items])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        tweet = self._tweets[index]
+        if tweet is None:
+            from lib.twitter_api.models.user import User
+
+            item = self._items[index]
+            tweet = Tweet.from_dict(item)
+            author_data = item.get("author")
+            if author_data:
+                tweet.author = User.from_dict(author_data)
+            self._tweets[index] = tweet
+        return tweet
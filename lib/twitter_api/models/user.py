@@ -6,12 +6,99 @@ User models for TwitterAPI.io client.
 
 import dataclasses
 import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
 
+from lib.twitter_api.utils.codegen import ALWAYS, NOT_NONE, TRUTHY, compile_to_dict
 from lib.twitter_api.utils.date_utils import parse_twitter_date
 
-
-@dataclasses.dataclass
+# نام‌های جایگزین هر فیلد در پاسخ endpointهای مختلف (به ترتیب اولویت)
+_FOLLOWERS_KEYS = ("followers_count", "followers")
+_FOLLOWING_KEYS = ("following_count", "following", "friends_count")
+_TWEET_COUNT_KEYS = ("statuses_count", "statusesCount")
+_MEDIA_COUNT_KEYS = ("media_count", "mediaCount")
+_FAVOURITES_KEYS = ("favourites_count", "favouritesCount")
+_VERIFIED_KEYS = ("isBlueVerified", "verified", "isVerified")
+_USERNAME_KEYS = ("screen_name", "userName")
+_CREATED_AT_KEYS = ("created_at", "createdAt")
+_PROFILE_PICTURE_KEYS = ("profile_image_url_https", "profilePicture")
+_COVER_PICTURE_KEYS = ("profile_banner_url", "coverPicture")
+
+# نشانگر «کلید وجود ندارد» برای ترکیب بررسی وجود و خواندن در یک lookup
+_MISSING = object()
+
+
+# Defaults merged under the API dict in User.from_dict (values present in data win)
+_USER_DEFAULTS = {
+    "id": None, "name": "", "description": None, "location": None, "url": None,
+    "isAutomated": False, "automated": False, "automatedBy": None,
+    "unavailable": False, "message": None, "unavailableReason": None,
+    "withheldInCountries": None, "withheld_in_countries": None,
+    "pinnedTweetIds": None, "pinned_tweet_ids": None,
+}
+
+
+def _first(data: Dict[str, Any], keys: Tuple[str, ...], default: Any = None) -> Any:
+    """Return the value of the first alias in ``keys`` that is present and not None."""
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            return value
+    return default
+
+
+def _present(data: Dict[str, Any], key: str, alt_key: str) -> Any:
+    """Return ``data[key]`` if the key is present (even if falsy), else ``data.get(alt_key)``."""
+    value = data.get(key, _MISSING)
+    if value is _MISSING:
+        return data.get(alt_key)
+    return value
+
+
+def _first_int(data: Dict[str, Any], keys: Tuple[str, ...], default: Optional[int]) -> Optional[int]:
+    """Return the first alias in ``keys`` whose value converts to int, else ``default``."""
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            try:
+                return int(value)
+            except (ValueError, TypeError):
+                pass
+    return default
+
+
+# (key, condition, expression) for User.to_dict; $v is self.<key>
+_USER_TO_DICT_SPEC = (
+    ("type", ALWAYS, "$v"),
+    ("id", ALWAYS, "$v"),
+    ("username", ALWAYS, "$v"),
+    ("name", ALWAYS, "$v"),
+    ("followers_count", ALWAYS, "$v"),
+    ("following_count", ALWAYS, "$v"),
+    ("tweet_count", ALWAYS, "$v"),
+    ("is_blue_verified", ALWAYS, "$v"),
+    ("unavailable", ALWAYS, "$v"),
+    ("profile_picture", TRUTHY, "$v"),
+    ("cover_picture", TRUTHY, "$v"),
+    ("description", TRUTHY, "$v"),
+    ("location", TRUTHY, "$v"),
+    ("url", TRUTHY, "$v"),
+    ("created_at", TRUTHY, "$v.isoformat()"),
+    ("media_count", NOT_NONE, "$v"),
+    ("favourites_count", NOT_NONE, "$v"),
+    ("is_automated", TRUTHY, "$v"),
+    ("automated_by", TRUTHY, "$v"),
+    ("can_dm", NOT_NONE, "$v"),
+    ("is_translator", NOT_NONE, "$v"),
+    ("has_custom_timelines", NOT_NONE, "$v"),
+    ("possibly_sensitive", NOT_NONE, "$v"),
+    ("unavailable_message", TRUTHY, "$v"),
+    ("unavailable_reason", TRUTHY, "$v"),
+    ("withheld_in_countries", TRUTHY, "$v"),
+    ("pinned_tweet_ids", TRUTHY, "$v"),
+)
+
+
+@dataclasses.dataclass(slots=True)
 class User:
     """
     Model for Twitter user data.
@@ -24,8 +111,8 @@ class User:
     username: str  # screen_name in API response
     name: str
 
-    # API type field (must be after non-default arguments)
-    type: str = "user"  # مقدار ثابت طبق مستندات API
+    # API type field (constant per class; not an instance field)
+    type: ClassVar[str] = "user"  # مقدار ثابت طبق مستندات API
 
     # Profile details
     profile_picture: Optional[str] = None
@@ -63,6 +150,9 @@ class User:
     # Raw data
     raw_data: Optional[Dict[str, Any]] = None
 
+    # Same bulk-ingest switch as Tweet._keep_raw
+    _keep_raw = True
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'User':
         """
@@ -71,17 +161,20 @@ class User:
         This method handles the discrepancies between user info formats
         from different endpoints (screen_name vs userName, etc.)
         """
+        # Merge defaults once (C-level); presence checks below still use data
+        d = _USER_DEFAULTS | data
+
         # Handle different field names and nested structures
-        user_id = data.get("id")
+        user_id = d["id"]
 
         # Username: handle both screen_name and userName
-        username = data.get("screen_name") or data.get("userName") or ""
+        username = _first(data, _USERNAME_KEYS, "")
 
         # Name
-        name = data.get("name", "")
+        name = d["name"]
 
         # Parse created_at - handle both formats
-        created_at_str = data.get("created_at") or data.get("createdAt")
+        created_at_str = _first(data, _CREATED_AT_KEYS)
         created_at = None
         if created_at_str:
             try:
@@ -89,95 +182,46 @@ class User:
             except (ValueError, TypeError):
                 pass
 
-        # Parse followers/following - handle different field names
-        followers_count = 0
-        for field in ["followers_count", "followers"]:
-            if field in data and data[field] is not None:
-                try:
-                    followers_count = int(data[field])
-                    break
-                except (ValueError, TypeError):
-                    pass
-
-        # Handle different field names for following
-        following_count = 0
-        for field in ["following_count", "following", "friends_count"]:
-            if field in data and data[field] is not None:
-                try:
-                    following_count = int(data[field])
-                    break
-                except (ValueError, TypeError):
-                    pass
-
-        # Handle different field names for tweets count
-        tweet_count = 0
-        for field in ["statuses_count", "statusesCount"]:
-            if field in data and data[field] is not None:
-                try:
-                    tweet_count = int(data[field])
-                    break
-                except (ValueError, TypeError):
-                    pass
+        # Parse counts - handle different field names
+        followers_count = _first_int(data, _FOLLOWERS_KEYS, 0)
+        following_count = _first_int(data, _FOLLOWING_KEYS, 0)
+        tweet_count = _first_int(data, _TWEET_COUNT_KEYS, 0)
 
         # Parse optional counts
-        media_count = None
-        if "media_count" in data:
-            try:
-                media_count = int(data["media_count"])
-            except (ValueError, TypeError):
-                pass
-        elif "mediaCount" in data:
-            try:
-                media_count = int(data["mediaCount"])
-            except (ValueError, TypeError):
-                pass
-
-        favourites_count = None
-        for field in ["favourites_count", "favouritesCount"]:
-            if field in data and data[field] is not None:
-                try:
-                    favourites_count = int(data[field])
-                    break
-                except (ValueError, TypeError):
-                    pass
+        media_count = _first_int(data, _MEDIA_COUNT_KEYS, None)
+        favourites_count = _first_int(data, _FAVOURITES_KEYS, None)
 
         # Parse verification status - handle different field names
         is_blue_verified = False
-        for field in ["isBlueVerified", "verified", "isVerified"]:
-            if field in data:
-                is_blue_verified = bool(data[field])
+        for field in _VERIFIED_KEYS:
+            value = data.get(field, _MISSING)
+            if value is not _MISSING:
+                is_blue_verified = bool(value)
                 if is_blue_verified:
                     break
 
         # Parse profile details - handle different field names
-        profile_picture = data.get("profile_image_url_https") or data.get("profilePicture")
-        cover_picture = data.get("profile_banner_url") or data.get("coverPicture")
-        description = data.get("description")
-        location = data.get("location")
-        url = data.get("url")
+        profile_picture = _first(data, _PROFILE_PICTURE_KEYS)
+        cover_picture = _first(data, _COVER_PICTURE_KEYS)
+        description = d["description"]
+        location = d["location"]
+        url = d["url"]
 
         # Parse boolean flags - handle both formats
-        is_automated = data.get("isAutomated", False) or data.get("automated", False)
-        can_dm = data.get("can_dm") if "can_dm" in data else data.get("canDm")
-        is_translator = data.get("is_translator") if "is_translator" in data else data.get("isTranslator")
-        has_custom_timelines = data.get("has_custom_timelines") if "has_custom_timelines" in data else data.get(
-            "hasCustomTimelines")
-        possibly_sensitive = data.get("possibly_sensitive") if "possibly_sensitive" in data else data.get(
-            "possiblySensitive")
+        is_automated = d["isAutomated"] or d["automated"]
+        can_dm = _present(data, "can_dm", "canDm")
+        is_translator = _present(data, "is_translator", "isTranslator")
+        has_custom_timelines = _present(data, "has_custom_timelines", "hasCustomTimelines")
+        possibly_sensitive = _present(data, "possibly_sensitive", "possiblySensitive")
 
         # Parse unavailable status
-        unavailable = data.get("unavailable", False)
-        unavailable_message = data.get("message") if unavailable else None
-        unavailable_reason = data.get("unavailableReason") if unavailable else None
+        unavailable = d["unavailable"]
+        unavailable_message = d["message"] if unavailable else None
+        unavailable_reason = d["unavailableReason"] if unavailable else None
 
         # Parse lists
-        withheld_in_countries = data.get("withheldInCountries", []) or data.get("withheld_in_countries", [])
-        if withheld_in_countries is None:
-            withheld_in_countries = []
-
-        pinned_tweet_ids = data.get("pinnedTweetIds", []) or data.get("pinned_tweet_ids", [])
-        if pinned_tweet_ids is None:
-            pinned_tweet_ids = []
+        withheld_in_countries = d["withheldInCountries"] or d["withheld_in_countries"] or []
+        pinned_tweet_ids = d["pinnedTweetIds"] or d["pinned_tweet_ids"] or []
 
         # Create User object
         return cls(
@@ -197,7 +241,7 @@ class User:
             created_at=created_at,
             is_blue_verified=is_blue_verified,
             is_automated=is_automated,
-            automated_by=data.get("automatedBy"),
+            automated_by=d["automatedBy"],
             can_dm=can_dm,
             is_translator=is_translator,
             has_custom_timelines=has_custom_timelines,
@@ -207,81 +251,22 @@ class User:
             unavailable_reason=unavailable_reason,
             withheld_in_countries=withheld_in_countries,
             pinned_tweet_ids=pinned_tweet_ids,
-            raw_data=data
+            raw_data=data if cls._keep_raw else None
         )
 
-    def to_dict(self) -> Dict[str, Any]:
+    @classmethod
+    def from_list(cls, items: List[Dict[str, Any]]) -> List['User']:
         """
-        Convert User object to dictionary.
+        Create User objects from a list of dictionaries (one API page).
+
+        Args:
+            items: List of user dictionaries from TwitterAPI.io
 
         Returns:
-            Dictionary representation of the user
+            List of User objects
         """
-        result = {
-            "type": self.type,
-            "id": self.id,
-            "username": self.username,
-            "name": self.name,
-            "followers_count": self.followers_count,
-            "following_count": self.following_count,
-            "tweet_count": self.tweet_count,
-            "is_blue_verified": self.is_blue_verified,
-            "unavailable": self.unavailable,
-        }
-
-        # Add optional fields if present
-        if self.profile_picture:
-            result["profile_picture"] = self.profile_picture
-
-        if self.cover_picture:
-            result["cover_picture"] = self.cover_picture
-
-        if self.description:
-            result["description"] = self.description
-
-        if self.location:
-            result["location"] = self.location
-
-        if self.url:
-            result["url"] = self.url
-
-        if self.created_at:
-            result["created_at"] = self.created_at.isoformat()
-
-        if self.media_count is not None:
-            result["media_count"] = self.media_count
-
-        if self.favourites_count is not None:
-            result["favourites_count"] = self.favourites_count
-
-        if self.is_automated:
-            result["is_automated"] = self.is_automated
-
-        if self.automated_by:
-            result["automated_by"] = self.automated_by
-
-        if self.can_dm is not None:
-            result["can_dm"] = self.can_dm
-
-        if self.is_translator is not None:
-            result["is_translator"] = self.is_translator
-
-        if self.has_custom_timelines is not None:
-            result["has_custom_timelines"] = self.has_custom_timelines
-
-        if self.possibly_sensitive is not None:
-            result["possibly_sensitive"] = self.possibly_sensitive
-
-        if self.unavailable_message:
-            result["unavailable_message"] = self.unavailable_message
-
-        if self.unavailable_reason:
-            result["unavailable_reason"] = self.unavailable_reason
-
-        if self.withheld_in_countries:
-            result["withheld_in_countries"] = self.withheld_in_countries
-
-        if self.pinned_tweet_ids:
-            result["pinned_tweet_ids"] = self.pinned_tweet_ids
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in items]
 
-        return result
\ No newline at end of file
+    # Convert User object to dictionary; generated once from _USER_TO_DICT_SPEC
+    to_dict = compile_to_dict("User.to_dict", _USER_TO_DICT_SPEC)
@@ -9,7 +9,7 @@ from typing import Any, Dict, Optional
 
 from lib.twitter_api.exceptions import TwitterAPIValidationError
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class WebhookRule:
     """
     Model for TwitterAPI.io webhook/websocket tweet filter rule.
@@ -69,18 +69,28 @@ class WebhookRule:
         Returns:
             Dictionary representation of the webhook rule
         """
-        result = {
-            "tag": self.tag,
-            "value": self.value,
-            "interval_seconds": self.interval_seconds,
-        }
-
-        # Include rule_id if requested and available
-        if include_rule_id and self.rule_id:
-            result["rule_id"] = self.rule_id
-
-        # Include is_effect for update operations
-        if include_rule_id:  # Only include in operations that would use rule_id
-            result["is_effect"] = 1 if self.is_active else 0
-
-        return result
\ No newline at end of file
+        if include_rule_id:
+            return _to_dict_update(self)
+        return _to_dict_create(self)
+
+
+def _to_dict_create(rule: WebhookRule) -> Dict[str, Any]:
+    """Dictionary shape for creating a rule (no rule_id / is_effect)."""
+    return {
+        "tag": rule.tag,
+        "value": rule.value,
+        "interval_seconds": rule.interval_seconds,
+    }
+
+
+def _to_dict_update(rule: WebhookRule) -> Dict[str, Any]:
+    """Dictionary shape for update operations (rule_id if available, and is_effect)."""
+    result = {
+        "tag": rule.tag,
+        "value": rule.value,
+        "interval_seconds": rule.interval_seconds,
+    }
+    if rule.rule_id:
+        result["rule_id"] = rule.rule_id
+    result["is_effect"] = 1 if rule.is_active else 0
+    return result
@@ -3,6 +3,8 @@ Test script for TwitterAPI.io query operators with detailed validation.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
 from lib.twitter_api import TwitterAPIClient
 
 # تنظیم لاگ
@@ -15,6 +17,9 @@ logger = logging.getLogger("query_test")
 # کلید API
 API_KEY = "cf5800d7a52a4df89b5df7ffe1c7303d"
 
+# تعداد کوئری‌های هم‌زمان (فراخوانی‌ها عمدتاً منتظر شبکه هستند)
+MAX_WORKERS = 8
+
 # لیست کوئری‌ها
 QUERIES = [
     "lang:fa since:2023-01-01",
@@ -40,11 +45,20 @@ QUERIES = [
     "هوش مصنوعی lang:fa filter:media since_time:1672531200",
 ]
 
-def test_query(client, query):
-    """تست کوئری با اعتبارسنجی فیلترها."""
+def run_query(client, query):
+    """اجرای کوئری؛ خروجی: (query, tweets, error)."""
+    try:
+        return query, client.search_tweets(query, max_results=5), None
+    except Exception as e:
+        return query, None, e
+
+def log_result(query, tweets, error):
+    """لاگ نتیجه یک کوئری با اعتبارسنجی فیلترها."""
+    logger.info(f"Testing query: {query}")
+    if error is not None:
+        logger.error(f"Failed for query: {query} - Error: {str(error)}")
+        return
     try:
-        logger.info(f"Testing query: {query}")
-        tweets = client.search_tweets(query, max_results=5)
         logger.info(f"Found {len(tweets)} tweets for query: {query}")
 
         if tweets:
@@ -61,12 +75,18 @@ def test_query(client, query):
     except Exception as e:
         logger.error(f"Failed for query: {query} - Error: {str(e)}")
 
+def test_query(client, query):
+    """تست کوئری با اعتبارسنجی فیلترها."""
+    log_result(*run_query(client, query))
+
 def main():
     """اجرای تست‌ها."""
     client = TwitterAPIClient(API_KEY)
-    for query in QUERIES:
-        test_query(client, query)
-        logger.info("-" * 50)
+    # درخواست‌ها به صورت هم‌زمان اجرا می‌شوند و نتایج به ترتیب QUERIES لاگ می‌شوند
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for result in executor.map(lambda query: run_query(client, query), QUERIES):
+            log_result(*result)
+            logger.info("-" * 50)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
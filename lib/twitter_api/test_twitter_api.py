@@ -4,11 +4,19 @@ Test script for TwitterAPI.io client.
 This script thoroughly tests all client functionality with real API calls.
 """
 
+import functools
+import io
 import os
 import sys
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Any, Dict, List
 
+import requests
+from requests.adapters import BaseAdapter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,10 +26,31 @@ logger = logging.getLogger("twitter_api_test")
 
 # Import the client
 from lib.twitter_api import TwitterAPIClient, Tweet, User, TwitterAPIError, TwitterAPIValidationError
+from lib.twitter_api.middleware import OptimizedTwitterAPIClient
 
 # Get API key from environment variable or set it here
 API_KEY = "cf5800d7a52a4df89b5df7ffe1c7303d"
 
+# Directory of the on-disk response cache shared by test runs
+TEST_CACHE_DIR = '.twitter_test_cache'
+
+
+@functools.lru_cache(maxsize=None)
+def get_client():
+    """
+    Shared client, built on first use: all tests reuse one session (keep-alive pool).
+
+    Responses are cached on disk with per-endpoint TTLs (e.g. 5 min for
+    search, 1 h for user info), so re-running the suite mostly avoids the API.
+    "Latest" searches are not idempotent and bypass the cache (skip_cache=True).
+    """
+    return OptimizedTwitterAPIClient(
+        api_key=API_KEY,
+        daily_budget_usd=1.0,
+        enable_cache=True,
+        cache_dir=TEST_CACHE_DIR,
+    )
+
 
 def print_separator(title):
     """Print a separator with title for better test output readability."""
@@ -30,62 +59,67 @@ def print_separator(title):
     print("=" * 80 + "\n")
 
 
-def test_search_tweets():
-    """Test searching tweets with various parameters."""
-    print_separator("TEST: Search Tweets")
-
-    client = TwitterAPIClient(API_KEY)
+def consume_without_overfetch(iterator, limit=5):
+    """
+    Take up to ``limit`` items and check that no page was requested after the last one.
 
-    # Test basic search
-    print("Testing basic search...")
-    tweets = client.search_tweets(
-        query="python programming",
-        query_type="Latest",
-        max_results=5
-    )
-    print(f"✓ Found {len(tweets)} tweets")
+    The iterator must be created with ``max_results=limit``. A short or empty page
+    legitimately needs another page, so the number of pages is not fixed; what must
+    not happen is a fetch (or a pending prefetch) once the last item has been yielded.
+    """
+    count = 0
+    pages_at_last_item = 0
+    for _ in islice(iterator, limit):
+        count += 1
+        pages_at_last_item = iterator.page_count
+    print(f"✓ Iterator yielded {count} items from {iterator.page_count} page(s)")
+    if count == limit:
+        assert iterator.page_count == pages_at_last_item, "Iterator fetched a page after the last needed item"
+        pending = getattr(iterator, "_next_page_future", None) or getattr(iterator, "next_page_future", None)
+        assert pending is None, "Iterator prefetched a page that is not needed"
+    return count
 
-    # Test with different query_type
-    print("Testing 'Top' query type...")
-    top_tweets = client.search_tweets(
-        query="python programming",
-        query_type="Top",
-        max_results=5
-    )
-    print(f"✓ Found {len(top_tweets)} top tweets")
 
-    # Test pagination
-    print("Testing pagination...")
-    page1 = client.search_tweets(
-        query="python programming",
-        max_pages=1
-    )
-    print(f"✓ Page 1: {len(page1)} tweets")
+def test_search_tweets():
+    """Test searching tweets with various parameters."""
+    print_separator("TEST: Search Tweets")
 
-    # Test with various query operators
-    print("Testing complex query...")
-    complex_query = client.search_tweets(
-        query="from:elonmusk min_faves:1000 -filter:replies",
-        max_results=3
-    )
-    print(f"✓ Complex query returned {len(complex_query)} tweets")
+    client = get_client()
+
+    # The searches are independent, so they run concurrently; results are
+    # reported in order: (description, search_tweets kwargs, result label)
+    subtests = [
+        ("basic search", dict(query="python programming", query_type="Latest", max_results=5, skip_cache=True),
+         "Found {} tweets"),
+        ("'Top' query type", dict(query="python programming", query_type="Top", max_results=5),
+         "Found {} top tweets"),
+        ("pagination", dict(query="python programming", max_pages=1, skip_cache=True),
+         "Page 1: {} tweets"),
+        ("complex query", dict(query="from:elonmusk min_faves:1000 -filter:replies", max_results=3,
+                               skip_cache=True),
+         "Complex query returned {} tweets"),
+    ]
+    with ThreadPoolExecutor(max_workers=len(subtests)) as executor:
+        futures = [executor.submit(client.search_tweets, **kwargs) for _, kwargs, _ in subtests]
+        for (name, _, label), future in zip(subtests, futures):
+            print(f"Testing {name}...")
+            print("✓ " + label.format(len(future.result())))
 
     # Test search_tweets_iter
     print("Testing tweet iterator...")
-    count = 0
-    for tweet in client.search_tweets_iter(
+    with client.bypass_cache():
+        tweets_iter = client.search_tweets_iter(
             query="python programming",
             max_results=5
-    ):
-        count += 1
-    print(f"✓ Iterator yielded {count} tweets")
+        )
+        consume_without_overfetch(tweets_iter, 5)
 
     print("✓ All search_tweets tests passed!")
 
 
 def test_user_info():
     print_separator("TEST: User Info")
-    client = TwitterAPIClient(API_KEY)
+    client = get_client()
     print("Testing get_user_info by username...")
     try:
         user = client.get_user_info("elonmusk")
@@ -96,15 +130,17 @@ def test_user_info():
     except Exception as e:
         print(f"✗ Error getting user info: {e}")
         raise
-    print("Testing get_user_info_by_id...")
+    print("Testing get_users_by_ids (batch lookup)...")
     try:
-        user_id = user.id
-        user_by_id = client.get_user_info_by_id(user_id)
-        print(f"✓ Retrieved user by ID: @{user_by_id.username}")
-        assert user.id == user_by_id.id, "User IDs don't match"
-        print("✓ User info by ID verified")
+        # One batch_info_by_ids request covers any number of IDs
+        # (get_user_info_by_id is the single-ID form of the same endpoint)
+        user_ids = [user.id]
+        users_by_id = client.get_users_by_ids(user_ids)
+        print(f"✓ Retrieved {len(users_by_id)} user(s) by ID in one request")
+        assert [u.id for u in users_by_id] == user_ids, "User IDs don't match"
+        print(f"✓ User info by ID verified: @{users_by_id[0].username}")
     except Exception as e:
-        print(f"✗ Error getting user info by ID: {e}")
+        print(f"✗ Error getting users by ID: {e}")
         raise
     print("✓ All user_info tests passed!")
 
@@ -113,7 +149,7 @@ def test_user_tweets():
     """Test retrieving user tweets."""
     print_separator("TEST: User Tweets")
 
-    client = TwitterAPIClient(API_KEY)
+    client = get_client()
 
     # Test by username
     print("Testing get_user_tweets by username...")
@@ -141,13 +177,11 @@ def test_user_tweets():
     # Test iterator version
     print("Testing get_user_tweets_iter...")
     try:
-        count = 0
-        for tweet in client.get_user_tweets_iter(
-                username="elonmusk",
-                max_results=5
-        ):
-            count += 1
-        print(f"✓ Iterator yielded {count} tweets")
+        tweets_iter = client.get_user_tweets_iter(
+            username="elonmusk",
+            max_results=5
+        )
+        consume_without_overfetch(tweets_iter, 5)
     except Exception as e:
         print(f"✗ Error in tweets iterator: {e}")
         raise
@@ -159,19 +193,21 @@ def test_user_followers():
     """Test retrieving user followers."""
     print_separator("TEST: User Followers")
 
-    client = TwitterAPIClient(API_KEY)
+    client = get_client()
 
     print("Testing get_user_followers...")
     try:
+        # Raw dicts: only the sample inspected below is turned into a User
         followers = client.get_user_followers(
             username="elonmusk",
-            max_results=5
+            max_results=5,
+            convert_to_models=False
         )
         print(f"✓ Retrieved {len(followers)} followers")
 
         # Check follower objects
         if followers:
-            follower = followers[0]
+            follower = User.from_dict(followers[0])
             print(f"✓ Sample follower: @{follower.username or '(no username)'}, {follower.name}")
     except Exception as e:
         print(f"✗ Error getting followers: {e}")
@@ -184,19 +220,21 @@ def test_user_following():
     """Test retrieving users that a user is following."""
     print_separator("TEST: User Following")
 
-    client = TwitterAPIClient(API_KEY)
+    client = get_client()
 
     print("Testing get_user_following...")
     try:
+        # Raw dicts: only the sample inspected below is turned into a User
         following = client.get_user_following(
             username="elonmusk",
-            max_results=5
+            max_results=5,
+            convert_to_models=False
         )
         print(f"✓ Retrieved {len(following)} following")
 
         # Check following objects
         if following:
-            followed = following[0]
+            followed = User.from_dict(following[0])
             print(f"✓ Sample following: @{followed.username or '(no username)'}, {followed.name}")
     except Exception as e:
         print(f"✗ Error getting following: {e}")
@@ -205,22 +243,33 @@ def test_user_following():
     print("✓ All user_following tests passed!")
 
 
+@functools.lru_cache(maxsize=None)
+def find_popular_tweet_id():
+    """
+    ID of a popular tweet to use as a fixture (None if none found).
+
+    Looked up once per process; repeated runs within the search TTL are
+    served from the client's response cache.
+    """
+    popular_tweets = get_client().search_tweets(
+        query="from:elonmusk min_faves:10000",
+        query_type="Top",
+        max_results=1
+    )
+    return popular_tweets[0].id if popular_tweets else None
+
+
 def test_tweet_replies():
     """Test retrieving replies to a tweet."""
     print_separator("TEST: Tweet Replies")
 
-    client = TwitterAPIClient(API_KEY)
+    client = get_client()
 
     # First get a popular tweet
     print("Finding a popular tweet to check replies...")
-    popular_tweets = client.search_tweets(
-        query="from:elonmusk min_faves:10000",
-        query_type="Top",
-        max_results=1
-    )
+    tweet_id = find_popular_tweet_id()
 
-    if popular_tweets:
-        tweet_id = popular_tweets[0].id
+    if tweet_id:
         print(f"Found tweet: {tweet_id}")
 
         print("Testing get_tweet_replies...")
@@ -245,13 +294,11 @@ def test_tweet_replies():
         # Test iterator version
         print("Testing get_tweet_replies_iter...")
         try:
-            count = 0
-            for reply in client.get_tweet_replies_iter(
-                    tweet_id=tweet_id,
-                    max_results=5
-            ):
-                count += 1
-            print(f"✓ Iterator yielded {count} replies")
+            replies_iter = client.get_tweet_replies_iter(
+                tweet_id=tweet_id,
+                max_results=5
+            )
+            consume_without_overfetch(replies_iter, 5)
         except Exception as e:
             print(f"✗ Error in replies iterator: {e}")
             raise
@@ -265,7 +312,7 @@ def test_list_tweets():
     """Test retrieving tweets from a list."""
     print_separator("TEST: List Tweets")
 
-    client = TwitterAPIClient(API_KEY)
+    client = get_client()
 
     # You need a valid list ID
     list_id = "1650054154390052865"  # Replace with a real list ID
@@ -289,11 +336,27 @@ def test_list_tweets():
     print("✓ All list_tweets tests completed")
 
 
+class _NotFoundAdapter(BaseAdapter):
+    """Transport stub that answers every request with a 404 'User not found' response."""
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 404
+        response.headers["Content-Type"] = "application/json"
+        response._content = b'{"error": "User not found"}'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
 def test_error_handling():
     """Test error handling for invalid inputs and API errors."""
     print_separator("TEST: Error Handling")
 
-    client = TwitterAPIClient(API_KEY)
+    client = get_client()
 
     # Test invalid parameters
     print("Testing invalid parameters...")
@@ -305,10 +368,12 @@ def test_error_handling():
     except Exception as e:
         print(f"✗ Unexpected error type: {type(e).__name__}")
 
-    # Test invalid user
+    # Test invalid user against a stubbed 404 (no network request or API credit)
     print("Testing nonexistent user...")
+    offline_client = TwitterAPIClient(API_KEY)
+    offline_client.base.session.mount(offline_client.base.base_url, _NotFoundAdapter())
     try:
-        client.get_user_info("this_user_definitely_does_not_exist_12345678900987654321")
+        offline_client.get_user_info("this_user_definitely_does_not_exist_12345678900987654321")
         print("✗ Expected error for nonexistent user, but none was raised")
     except TwitterAPIError as e:
         print(f"✓ Correctly raised error for nonexistent user: {e}")
@@ -316,22 +381,85 @@ def test_error_handling():
     print("✓ All error handling tests completed")
 
 
-def run_all_tests():
-    """Run all tests."""
+ALL_TESTS = [
+    test_search_tweets,
+    test_user_info,
+    test_user_tweets,
+    test_user_followers,
+    test_user_following,
+    test_tweet_replies,
+    test_list_tweets,
+    test_error_handling,
+]
+
+
+class _ThreadOutput(io.TextIOBase):
+    """stdout proxy that sends each worker thread's prints to its own buffer."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self, buffer):
+        self._local.buffer = buffer
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def _run_test(output, test):
+    """Run one test in a worker thread; returns (captured output, exception or None)."""
+    buffer = io.StringIO()
+    output.capture(buffer)
     try:
-        test_search_tweets()
-        test_user_info()
-        test_user_tweets()
-        test_user_followers()
-        test_user_following()
-        test_tweet_replies()
-        test_list_tweets()
-        test_error_handling()
-
-        print("\n✓✓✓ All tests completed successfully!")
+        test()
+        return buffer.getvalue(), None
     except Exception as e:
-        print(f"\n✗✗✗ Tests failed: {e}")
-        raise
+        return buffer.getvalue(), e
+    finally:
+        output.capture(None)
+
+
+def run_all_tests():
+    """
+    Run all tests.
+
+    The tests are independent and spend their time waiting on the API, so
+    they run concurrently; each test's output is printed in order afterwards.
+    """
+    output = _ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(ALL_TESTS)) as executor:
+            results = list(executor.map(lambda test: _run_test(output, test), ALL_TESTS))
+    finally:
+        sys.stdout = output._stream
+
+    first_error = None
+    for text, error in results:
+        sys.stdout.write(text)
+        if error is not None and first_error is None:
+            first_error = error
+
+    if first_error is None:
+        # a repeated idempotent request must be served from the cache
+        client = get_client()
+        hits = client.get_cache_stats()['hits']
+        client.get_user_info("elonmusk")
+        stats = client.get_cache_stats()
+        print(f"\nCache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate_percent']:.1f}% hit rate)")
+        if stats['hits'] <= hits:
+            first_error = AssertionError("Repeated get_user_info was not served from the cache")
+
+    if first_error is not None:
+        print(f"\n✗✗✗ Tests failed: {first_error}")
+        raise first_error
+    print("\n✓✓✓ All tests completed successfully!")
 
 
 if __name__ == "__main__":
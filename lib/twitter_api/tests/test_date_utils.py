@@ -0,0 +1,132 @@
+"""
+Differential tests for date_utils.parse_twitter_date.
+
+تاریخ‌ها با پیاده‌سازی قدیمی مبتنی بر strptime مقایسه می‌شوند؛ هر ورودی که نسخه
+قدیمی می‌پذیرفت باید همان نتیجه را بدهد و خطاها همیشه TwitterAPIValidationError باشند.
+"""
+import datetime
+import itertools
+
+from lib.twitter_api.exceptions import TwitterAPIValidationError
+from lib.twitter_api.utils.date_utils import parse_twitter_date, parse_twitter_timestamps
+
+
+def legacy_parse_twitter_date(date_string):
+    """The strptime-based parser parse_twitter_date replaced (reference behaviour)."""
+    if not date_string:
+        raise TwitterAPIValidationError("Empty date string")
+    formats = [
+        "%a %b %d %H:%M:%S %z %Y",
+        "%Y-%m-%dT%H:%M:%SZ",
+        "%a %b %d %H:%M:%S %Y",
+    ]
+    for fmt in formats:
+        try:
+            dt = datetime.datetime.strptime(date_string, fmt)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=datetime.timezone.utc)
+            return dt
+        except ValueError:
+            continue
+    try:
+        return datetime.datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    try:
+        parts = date_string.split()
+        if len(parts) >= 6:
+            return datetime.datetime.strptime(' '.join(parts[1:]), "%b %d %H:%M:%S %z %Y")
+    except ValueError:
+        pass
+    raise TwitterAPIValidationError(f"Unrecognized date format: {date_string}")
+
+
+def _outcome(parse, date_string):
+    """(datetime, utcoffset) on success, the exception type otherwise."""
+    try:
+        dt = parse(date_string)
+    except Exception as e:
+        return type(e)
+    return dt, dt.utcoffset()
+
+
+def _date_strings():
+    weekdays = ["Tue", "tue", "Tuesday", "Xyz", ""]
+    months = ["Dec", "dec", "December", "Foo"]
+    days = ["1", "01", "10", "32"]
+    clocks = ["07:00:30", "7:0:30", "24:00:00"]
+    zones = ["+0000", "+0330", "-0500", "+05:30", "Z", "+2400", "+0099", "+2359", ""]
+    separators = [" ", "  "]
+    for weekday, month, day, clock, zone, sep in itertools.product(
+            weekdays, months, days, clocks, zones, separators):
+        fields = [weekday, month, day, clock, zone, "2024"]
+        yield sep.join(field for field in fields if field)
+    yield from [
+        "Tue Dec  1 07:00:30 +0000 2024",
+        "  Tue Dec 10 07:00:30 +0000 2024  ",
+        "Tuesday Dec 10 07:00:30 +0000 2024",
+        "Tue Dec 10 07:00:30 Z 2024",
+        "2024-12-10T07:00:30Z",
+        "2024-1-5T7:0:0Z",
+        "2024-12-10T07:00:30+00:00",
+        "2024-12-10T07:00:30+03:30",
+        "2024-12-10",
+        "not a date",
+        "Tue Dec 10 07:00:30 +0000 2024 extra",
+    ]
+
+
+def test_accepts_everything_the_strptime_parser_accepted():
+    for date_string in _date_strings():
+        expected = _outcome(legacy_parse_twitter_date, date_string)
+        if isinstance(expected, type):
+            continue
+        assert _outcome(parse_twitter_date, date_string) == expected, date_string
+
+
+def test_errors_are_validation_errors():
+    for date_string in list(_date_strings()) + ["Tue Dec 10 07:00:30 +2400 2024", "   "]:
+        outcome = _outcome(parse_twitter_date, date_string)
+        if isinstance(outcome, type):
+            assert outcome is TwitterAPIValidationError, date_string
+
+
+def test_out_of_range_offsets_are_rejected():
+    for offset in ("+2400", "-2400", "+0099", "+0060"):
+        outcome = _outcome(parse_twitter_date, f"Tue Dec 10 07:00:30 {offset} 2024")
+        assert outcome is TwitterAPIValidationError, offset
+
+
+def test_non_string_input_raises_type_error():
+    # models catch (ValueError, TypeError) and fall back to now(), as with strptime
+    for value in (1700000000, 1.5, b"Tue Dec 10 07:00:30 +0000 2024"):
+        assert _outcome(parse_twitter_date, value) is TypeError, value
+        assert _outcome(legacy_parse_twitter_date, value) is TypeError, value
+
+
+def test_bulk_timestamps_match_single_parse():
+    date_strings = [s for s in _date_strings()
+                    if not isinstance(_outcome(parse_twitter_date, s), type)]
+    expected = [int(parse_twitter_date(s).timestamp()) for s in date_strings]
+    assert parse_twitter_timestamps(date_strings) == expected
+
+
+
+def test_bulk_timestamps_reject_what_single_parse_rejects():
+    date_strings = [f"Mon Jan 01 {clock} +0000 2024"
+                    for clock in ("99:99:99", "24:00:00", "23:60:00", "23:59:60", "-1:00:00", "+1:00:00")]
+    date_strings += [f"Mon Jan 01 00:00:00 {offset} 2024" for offset in ("+-100", "-+100", "+2400")]
+    for date_string in date_strings:
+        assert _outcome(parse_twitter_date, date_string) is TwitterAPIValidationError, date_string
+        try:
+            parse_twitter_timestamps([date_string])
+        except TwitterAPIValidationError:
+            continue
+        raise AssertionError(f"parse_twitter_timestamps accepted {date_string!r}")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: OK")
@@ -6,9 +6,12 @@ Example usage of the TwitterAPI.io client for Hoshyar project.
 
 import logging
 import os
-from typing import List
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
 
 from lib.twitter_api import TwitterAPIClient, Tweet, User, TwitterAPIError
+from lib.twitter_api.utils.date_utils import format_display_date
 
 # Configure logging
 logging.basicConfig(
@@ -19,14 +22,42 @@ logging.basicConfig(
 # Get API key from environment variable or set it here
 API_KEY = "cf5800d7a52a4df89b5df7ffe1c7303d"
 
+# Shared client: all examples reuse one session (keep-alive connection pool)
+CLIENT = TwitterAPIClient(API_KEY)
+
+
+# Output templates (one format_map + one write per tweet/user)
+_TWEET_TEMPLATE = (
+    "{i}Tweet ID: {id}\n"
+    "{i}Author: @{author}\n"
+    "{i}Text: {text}\n"
+    "{i}Created at: {created_at}\n"
+    "{i}Retweets: {retweets}, Likes: {likes}, Replies: {replies}\n"
+)
+_USER_TEMPLATE = (
+    "User ID: {id}\n"
+    "Username: @{username}\n"
+    "Name: {name}\n"
+    "Description: {description}\n"
+    "Location: {location}\n"
+    "Verified: {verified}\n"
+    "Followers: {followers}, Following: {following}\n"
+    "Created at: {created_at}\n"
+)
+
 
 def print_tweet(tweet: Tweet, indent: str = '') -> None:
     """Print tweet information in a readable format."""
-    print(f"{indent}Tweet ID: {tweet.id}")
-    print(f"{indent}Author: @{tweet.author.username if tweet.author else 'Unknown'}")
-    print(f"{indent}Text: {tweet.text}")
-    print(f"{indent}Created at: {tweet.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{indent}Retweets: {tweet.retweet_count}, Likes: {tweet.like_count}, Replies: {tweet.reply_count}")
+    sys.stdout.write(_TWEET_TEMPLATE.format_map({
+        'i': indent,
+        'id': tweet.id,
+        'author': tweet.author.username if tweet.author else 'Unknown',
+        'text': tweet.text,
+        'created_at': format_display_date(tweet.created_at),
+        'retweets': tweet.retweet_count,
+        'likes': tweet.like_count,
+        'replies': tweet.reply_count,
+    }))
 
     if tweet.quoted_tweet:
         print(f"{indent}Quoted Tweet:")
@@ -39,114 +70,69 @@ def print_tweet(tweet: Tweet, indent: str = '') -> None:
 
 def print_user(user: User) -> None:
     """Print user information in a readable format."""
-    print(f"User ID: {user.id}")
-    print(f"Username: @{user.username}")
-    print(f"Name: {user.name}")
-    print(f"Description: {user.description}")
-    print(f"Location: {user.location}")
-    print(f"Verified: {user.is_blue_verified}")
-    print(f"Followers: {user.followers_count}, Following: {user.following_count}")
-    print(f"Created at: {user.created_at.strftime('%Y-%m-%d %H:%M:%S') if user.created_at else 'Unknown'}")
-
-
-def example_search_tweets() -> None:
-    """Example of searching tweets."""
-    print("\n=== Search Tweets Example ===\n")
-
-    client = TwitterAPIClient(API_KEY)
-
+    sys.stdout.write(_USER_TEMPLATE.format_map({
+        'id': user.id,
+        'username': user.username,
+        'name': user.name,
+        'description': user.description,
+        'location': user.location,
+        'verified': user.is_blue_verified,
+        'followers': user.followers_count,
+        'following': user.following_count,
+        'created_at': format_display_date(user.created_at) if user.created_at else 'Unknown',
+    }))
+
+
+# Request/response examples: (title, client method, kwargs, summary, item label, printer).
+# They are independent, so main() fetches them concurrently and prints in order.
+EXAMPLES = [
+    ("Search Tweets", "search_tweets",
+     dict(query="برنامه‌نویسی OR هوش‌مصنوعی lang:fa", query_type="Latest", max_results=5),
+     "Found {} tweets:", "Tweet", print_tweet),
+    ("Get User Tweets", "get_user_tweets",
+     dict(username="hashemisattar", max_results=3),  # Replace with a real username
+     "Found {} tweets from user:", "Tweet", print_tweet),
+    ("Get User Followers", "get_user_followers",
+     dict(username="elonmusk", max_results=3),  # Replace with a real username
+     "Found {} followers:", "Follower", print_user),
+    # نکته: بر اساس مستندات، فقط توییت‌های اصلی پشتیبانی می‌شوند، نه پاسخ‌ها
+    ("Get Tweet Replies", "get_tweet_replies",
+     dict(tweet_id="1234567890123456789", max_results=3),  # جایگزین با یک ID توییت اصلی معتبر
+     "Found {} replies:", "Reply", print_tweet),
+]
+
+
+def fetch_example(client: TwitterAPIClient, method: str, kwargs: dict):
+    """Call one client method; returns (result, error)."""
     try:
-        # Search for tweets in Farsi containing specific keywords
-        tweets = client.search_tweets(
-            query="برنامه‌نویسی OR هوش‌مصنوعی lang:fa",
-            query_type="Latest",
-            max_results=5,
-        )
-
-        print(f"Found {len(tweets)} tweets:")
-        for i, tweet in enumerate(tweets, 1):
-            print(f"\n--- Tweet {i} ---")
-            print_tweet(tweet)
-
+        return getattr(client, method)(**kwargs), None
     except TwitterAPIError as e:
-        print(f"Error: {e}")
+        return None, e
 
 
-def example_get_user_tweets() -> None:
-    """Example of getting user tweets."""
-    print("\n=== Get User Tweets Example ===\n")
+def print_example(title: str, items: List, error: Optional[TwitterAPIError],
+                  summary: str, label: str, printer: Callable) -> None:
+    """Print one example's result (or its error)."""
+    print(f"\n=== {title} Example ===\n")
 
-    client = TwitterAPIClient(API_KEY)
-
-    try:
-        # Get tweets from a specific user
-        tweets = client.get_user_tweets(
-            username="hashemisattar",  # Replace with a real username
-            max_results=3,
-        )
-
-        print(f"Found {len(tweets)} tweets from user:")
-        for i, tweet in enumerate(tweets, 1):
-            print(f"\n--- Tweet {i} ---")
-            print_tweet(tweet)
-
-    except TwitterAPIError as e:
-        print(f"Error: {e}")
-
-
-def example_get_user_followers() -> None:
-    """Example of getting user followers."""
-    print("\n=== Get User Followers Example ===\n")
-
-    client = TwitterAPIClient(API_KEY)
-
-    try:
-        # Get followers of a specific user
-        followers = client.get_user_followers(
-            username="elonmusk",  # Replace with a real username
-            max_results=3,
-        )
-
-        print(f"Found {len(followers)} followers:")
-        for i, user in enumerate(followers, 1):
-            print(f"\n--- Follower {i} ---")
-            print_user(user)
-
-    except TwitterAPIError as e:
-        print(f"Error: {e}")
-
-
-def example_get_tweet_replies() -> None:
-    """مثالی از دریافت پاسخ‌ها به یک توییت."""
-    print("\n=== Get Tweet Replies Example ===\n")
-
-    client = TwitterAPIClient(API_KEY)
-
-    try:
-        # نکته: بر اساس مستندات، فقط توییت‌های اصلی پشتیبانی می‌شوند، نه پاسخ‌ها
-        responses = client.get_tweet_replies(
-            tweet_id="1234567890123456789",  # جایگزین با یک ID توییت اصلی معتبر
-            max_results=3,
-        )
-
-        print(f"Found {len(responses)} replies:")
-        for i, tweet in enumerate(responses, 1):
-            if i <= 3:  # فقط 3 پاسخ اول را نمایش می‌دهیم
-                print(f"\n--- Reply {i} ---")
-                print_tweet(tweet)
-
-    except TwitterAPIError as e:
-        print(f"Error: {e}")
+    if error is not None:
+        print(f"Error: {error}")
         # پیشنهاد: پاسخ خام را برای کمک به دیباگ نشان دهید
-        if hasattr(e, 'response'):
-            print(f"Response data: {e.response}")
+        if getattr(error, 'response', None):
+            print(f"Response data: {error.response}")
+        return
+
+    print(summary.format(len(items)))
+    for i, item in enumerate(items, 1):
+        print(f"\n--- {label} {i} ---")
+        printer(item)
 
 
 def example_using_iterators() -> None:
     """Example of using iterators for efficient pagination."""
     print("\n=== Using Iterators Example ===\n")
 
-    client = TwitterAPIClient(API_KEY)
+    client = CLIENT
 
     try:
         # Use iterator to efficiently retrieve tweets
@@ -174,10 +160,14 @@ def example_using_iterators() -> None:
 def main() -> None:
     """Run all examples."""
     try:
-        example_search_tweets()
-        example_get_user_tweets()
-        example_get_user_followers()
-        example_get_tweet_replies()
+        client = CLIENT
+        with ThreadPoolExecutor(max_workers=len(EXAMPLES)) as executor:
+            futures = [executor.submit(fetch_example, client, method, kwargs)
+                       for _, method, kwargs, _, _, _ in EXAMPLES]
+            for (title, _, _, summary, label, printer), future in zip(EXAMPLES, futures):
+                items, error = future.result()
+                print_example(title, items, error, summary, label, printer)
+
         example_using_iterators()
 
     except Exception as e:
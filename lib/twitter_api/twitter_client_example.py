@@ -2,11 +2,15 @@
 نمونه کاربردی کتابخانه TwitterAPI.io که نشان می‌دهد چگونه از آن استفاده کنیم.
 """
 
-from lib.twitter_api import TwitterAPIClient
+from lib.twitter_api import TwitterAPIClient, TwitterAPIError
+from lib.twitter_api.utils.date_utils import format_display_date
 
 # کلید API را از متغیرهای محیطی بخوانید یا به صورت مستقیم وارد کنید
 API_KEY = "your_api_key_here"
 
+# کلاینت مشترک: همه مثال‌ها از یک session (و اتصال‌های keep-alive آن) استفاده می‌کنند
+CLIENT = TwitterAPIClient(API_KEY)
+
 def print_separator(title):
     """نمایش جداکننده با عنوان برای خوانایی بهتر خروجی"""
     print("\n" + "=" * 80)
@@ -17,7 +21,7 @@ def search_tweets_example():
     """نمونه‌ای از جستجوی توییت‌ها"""
     print_separator("جستجوی توییت‌ها")
 
-    client = TwitterAPIClient(API_KEY)
+    client = CLIENT
 
     try:
         # جستجوی توییت‌ها با کلمات کلیدی به زبان فارسی
@@ -34,7 +38,7 @@ def search_tweets_example():
             print(f"شناسه: {tweet.id}")
             print(f"نویسنده: @{tweet.author.username if tweet.author else 'ناشناس'}")
             print(f"متن: {tweet.text}")
-            print(f"تاریخ: {tweet.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"تاریخ: {format_display_date(tweet.created_at)}")
             print(f"بازتوییت: {tweet.retweet_count}, لایک: {tweet.like_count}, پاسخ: {tweet.reply_count}")
 
     except Exception as e:
@@ -44,7 +48,7 @@ def get_user_info_example():
     """نمونه‌ای از دریافت اطلاعات کاربر"""
     print_separator("اطلاعات کاربر")
 
-    client = TwitterAPIClient(API_KEY)
+    client = CLIENT
 
     try:
         # دریافت اطلاعات یک کاربر مشهور
@@ -57,7 +61,7 @@ def get_user_info_example():
         print(f"موقعیت: {user.location}")
         print(f"تأیید شده: {user.is_blue_verified}")
         print(f"دنبال‌کنندگان: {user.followers_count}, دنبال‌شده‌ها: {user.following_count}")
-        print(f"تاریخ ایجاد: {user.created_at.strftime('%Y-%m-%d %H:%M:%S') if user.created_at else 'نامشخص'}")
+        print(f"تاریخ ایجاد: {format_display_date(user.created_at) if user.created_at else 'نامشخص'}")
 
     except Exception as e:
         print(f"خطا: {str(e)}")
@@ -66,7 +70,7 @@ def get_user_followers_example():
     """نمونه‌ای از دریافت دنبال‌کنندگان کاربر"""
     print_separator("دنبال‌کنندگان کاربر")
 
-    client = TwitterAPIClient(API_KEY)
+    client = CLIENT
 
     try:
         # دریافت دنبال‌کنندگان یک کاربر مشهور
@@ -91,12 +95,13 @@ def get_user_tweets_example():
     """نمونه‌ای از دریافت توییت‌های کاربر"""
     print_separator("توییت‌های کاربر")
 
-    client = TwitterAPIClient(API_KEY)
+    client = CLIENT
+    username = "elonmusk"
 
     try:
         # دریافت توییت‌های یک کاربر
         tweets = client.get_user_tweets(
-            username="elonmusk",
+            username=username,
             max_results=3
         )
 
@@ -106,7 +111,7 @@ def get_user_tweets_example():
             print(f"\n--- توییت {i} ---")
             print(f"شناسه: {tweet.id}")
             print(f"متن: {tweet.text}")
-            print(f"تاریخ: {tweet.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"تاریخ: {format_display_date(tweet.created_at)}")
             print(f"بازتوییت: {tweet.retweet_count}, لایک: {tweet.like_count}")
 
         # توضیح در مورد نتایج خالی
@@ -117,13 +122,17 @@ def get_user_tweets_example():
     except Exception as e:
         print(f"خطا: {str(e)}")
 
+        # خطاهای برنامه‌نویسی (نه خطای API) نباید به درخواست شبکه دیگری منجر شوند
+        if not isinstance(e, TwitterAPIError):
+            raise
+
         # استفاده از گزینه جایگزین
         try:
             print("\nتلاش با استفاده از جستجوی پیشرفته برای توییت‌های اخیر:")
 
             # استفاده از جستجو به جای API user/last_tweets
             search_tweets = client.search_tweets(
-                query=f"from:{(username or user_id)} -filter:replies -filter:retweets",
+                query=f"from:{username} -filter:replies -filter:retweets",
                 query_type="Latest",
                 max_results=3
             )
@@ -134,7 +143,7 @@ def get_user_tweets_example():
                 print(f"\n--- توییت {i} ---")
                 print(f"شناسه: {tweet.id}")
                 print(f"متن: {tweet.text}")
-                print(f"تاریخ: {tweet.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+                print(f"تاریخ: {format_display_date(tweet.created_at)}")
                 print(f"بازتوییت: {tweet.retweet_count}, لایک: {tweet.like_count}")
 
         except Exception as search_error:
@@ -144,7 +153,7 @@ def get_tweet_replies_example():
     """نمونه‌ای از دریافت پاسخ‌های یک توییت"""
     print_separator("پاسخ‌های توییت")
 
-    client = TwitterAPIClient(API_KEY)
+    client = CLIENT
 
     try:
         # دریافت پاسخ‌های یک توییت
@@ -163,7 +172,7 @@ def get_tweet_replies_example():
             print(f"شناسه: {tweet.id}")
             print(f"نویسنده: @{tweet.author.username if tweet.author else 'ناشناس'}")
             print(f"متن: {tweet.text}")
-            print(f"تاریخ: {tweet.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"تاریخ: {format_display_date(tweet.created_at)}")
 
         # توضیح در مورد نتایج خالی
         if not replies:
@@ -177,7 +186,7 @@ def advanced_search_example():
     """نمونه‌ای از جستجوی پیشرفته"""
     print_separator("جستجوی پیشرفته")
 
-    client = TwitterAPIClient(API_KEY)
+    client = CLIENT
 
     try:
         # جستجوی پیشرفته با ترکیبی از عملگرها
@@ -211,7 +220,7 @@ def using_iterator_example():
     """نمونه‌ای از استفاده از ایتریتور برای صرفه‌جویی در حافظه"""
     print_separator("استفاده از ایتریتور")
 
-    client = TwitterAPIClient(API_KEY)
+    client = CLIENT
 
     try:
         # استفاده از ایتریتور برای دریافت نتایج به صورت تدریجی
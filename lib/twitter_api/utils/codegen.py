@@ -0,0 +1,61 @@
+"""
+Code generation helpers for TwitterAPI.io models.
+
+ابزارهای تولید کد برای مدل‌های کلاینت TwitterAPI.io
+"""
+
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+# Conditions for emitting a key
+ALWAYS = "always"  # همیشه در خروجی
+TRUTHY = "truthy"  # فقط اگر مقدار truthy باشد
+NOT_NONE = "not_none"  # فقط اگر مقدار None نباشد
+
+_CONDITIONS = {
+    TRUTHY: "if v:",
+    NOT_NONE: "if v is not None:",
+}
+
+
+def compile_to_dict(qualname: str, spec: Sequence[Tuple[str, str, str]]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Generate a straight-line ``to_dict`` method from a field spec.
+
+    The source is built and compiled once (at import time), the same way
+    ``dataclasses`` generates ``__init__``, so serialization runs without
+    per-call loops over fields.
+
+    Args:
+        qualname: Qualified name for the generated function (e.g. "Tweet.to_dict")
+        spec: Sequence of (key, condition, expression). ``$v`` in the expression
+            stands for ``self.<key>``; keys are emitted in spec order.
+
+    Returns:
+        Function suitable for use as a ``to_dict`` method
+    """
+    lines = ["def to_dict(self):"]
+    head = []
+    index = 0
+    # Leading unconditional keys go into the initial dict literal
+    while index < len(spec) and spec[index][1] == ALWAYS:
+        key, _, expr = spec[index]
+        head.append(f"{key!r}: {expr.replace('$v', f'self.{key}')}")
+        index += 1
+    lines.append(f"    result = {{{', '.join(head)}}}")
+
+    for key, condition, expr in spec[index:]:
+        if condition == ALWAYS:
+            lines.append(f"    result[{key!r}] = {expr.replace('$v', f'self.{key}')}")
+            continue
+        if condition not in _CONDITIONS:
+            raise ValueError(f"Unknown to_dict condition for {key!r}: {condition!r}")
+        lines.append(f"    v = self.{key}")
+        lines.append(f"    {_CONDITIONS[condition]}")
+        lines.append(f"        result[{key!r}] = {expr.replace('$v', 'v')}")
+    lines.append("    return result")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), f"<{qualname}>", "exec"), {}, namespace)
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = qualname
+    return to_dict
@@ -5,17 +5,121 @@ Date utilities for TwitterAPI.io client.
 """
 
 import datetime
+import functools
 import re
 import time
-from typing import Optional, Union
+from typing import Iterable, List, Optional, Union
 
 from lib.twitter_api.exceptions import TwitterAPIValidationError
 
+_UTC = datetime.timezone.utc
 
+# Standard Twitter format: "Tue Dec 10 07:00:30 +0000 2024" (C-locale names)
+_WEEKDAYS = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+# Index tables for formatting (weekday() → name, month → name)
+_WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTH_NAMES = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _parse_standard_twitter_date(date_string: str) -> Optional[datetime.datetime]:
+    """
+    Parse the standard Twitter format by splitting on its fixed layout.
+
+    Returns None when the string does not have that exact shape, so the
+    caller can fall back to the regex-based formats.
+    """
+    parts = date_string.split(" ")
+    if len(parts) != 6 or parts[0] not in _WEEKDAYS:
+        return None
+    month = _MONTHS.get(parts[1])
+    if month is None:
+        return None
+
+    day, clock, offset, year = parts[2], parts[3], parts[4], parts[5]
+    if (len(clock) != 8 or clock[2] != ":" or clock[5] != ":"
+            or len(offset) != 5 or offset[0] not in "+-"
+            or not 1 <= len(day) <= 2 or len(year) != 4):
+        return None
+    digits = day + clock[:2] + clock[3:5] + clock[6:] + offset[1:] + year
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+
+    tz = _offset_timezone(offset[0], int(offset[1:3]), int(offset[3:]))
+    if tz is None:
+        return None
+
+    try:
+        return datetime.datetime(int(year), month, int(day),
+                                 int(clock[:2]), int(clock[3:5]), int(clock[6:]), tzinfo=tz)
+    except ValueError:
+        return None
+
+
+# "[Tue ]Dec 10 07:00:30[ +0000] 2024"; slow path for what the split parser rejects.
+# Mirrors strptime's leniency: any whitespace run between fields, any case,
+# full or abbreviated names, and "Z" / "+HHMM" / "+HH:MM" as the zone
+_TWITTER_DATE_RE = re.compile(
+    r'(?:(\w+)\s+)?(\w+)\s+(\d{1,2})\s+(\d{1,2}):(\d{1,2}):(\d{1,2})'
+    r'(?:\s+(Z|[+-]\d{2}:?\d{2}))?\s+(\d{4})',
+    re.IGNORECASE,
+)
+
+# Month lookup for the slow path: lower-case abbreviated and full names
+_MONTH_LOOKUP = {name.lower(): number for name, number in _MONTHS.items()}
+_MONTH_LOOKUP.update({
+    "january": 1, "february": 2, "march": 3, "april": 4, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+})
+
+# "2024-1-5T7:0:0Z"; ISO without zero padding, which fromisoformat rejects
+_LOOSE_ISO_DATE_RE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})T(\d{1,2}):(\d{1,2}):(\d{1,2})Z$')
+
+
+def _offset_timezone(sign: str, hours: int, minutes: int) -> Optional[datetime.tzinfo]:
+    """UTC offset as a tzinfo; None if hours/minutes are out of range (e.g. "+2400", "+0099")."""
+    if hours >= 24 or minutes >= 60:
+        return None
+    offset_minutes = hours * 60 + minutes
+    if offset_minutes == 0:
+        return _UTC
+    if sign == "-":
+        offset_minutes = -offset_minutes
+    return datetime.timezone(datetime.timedelta(minutes=offset_minutes))
+
+
+def _from_twitter_date_match(match: "re.Match[str]") -> Optional[datetime.datetime]:
+    """Build a datetime from a ``_TWITTER_DATE_RE`` match; None if a field is out of range."""
+    _, month_name, day, hour, minute, second, offset, year = match.groups()
+    month = _MONTH_LOOKUP.get(month_name.lower())
+    if month is None:
+        return None
+
+    tz = _UTC
+    if offset is not None and offset not in ("Z", "z"):
+        digits = offset[1:].replace(":", "")
+        tz = _offset_timezone(offset[0], int(digits[:2]), int(digits[2:]))
+        if tz is None:
+            return None
+
+    try:
+        return datetime.datetime(int(year), month, int(day),
+                                 int(hour), int(minute), int(second), tzinfo=tz)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_twitter_date(date_string: str) -> datetime.datetime:
     """
     Parse Twitter date string into a datetime object.
 
+    Results are memoized (LRU) since API pages often repeat timestamps.
+
     Handles multiple date formats used by Twitter API:
     - "Tue Dec 10 07:00:30 +0000 2024" (standard Twitter format)
     - "2024-12-10T07:00:30Z" (ISO 8601 format)
@@ -31,49 +135,115 @@ def parse_twitter_date(date_string: str) -> datetime.datetime:
     Raises:
         TwitterAPIValidationError: If date string is invalid
     """
+    if not date_string:
+        raise TwitterAPIValidationError("Empty date string")
+    if not isinstance(date_string, str):
+        raise TypeError(f"date_string must be str, not {type(date_string).__name__}")
+    date_string = date_string.strip()
     if not date_string:
         raise TwitterAPIValidationError("Empty date string")
 
-    # Try different formats
-    formats = [
-        "%a %b %d %H:%M:%S %z %Y",  # "Tue Dec 10 07:00:30 +0000 2024"
-        "%Y-%m-%dT%H:%M:%SZ",  # "2024-12-10T07:00:30Z"
-        "%a %b %d %H:%M:%S %Y",  # "Tue Dec 10 07:00:30 2024" (without timezone)
-    ]
-
-    for fmt in formats:
+    # Dispatch on the first character: digit → ISO 8601, otherwise the
+    # standard Twitter format; both fast paths avoid strptime
+    if date_string[0].isdigit():
         try:
-            dt = datetime.datetime.strptime(date_string, fmt)
-            # Add UTC timezone if missing
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=datetime.timezone.utc)
-            return dt
+            return datetime.datetime.fromisoformat(date_string.replace('Z', '+00:00'))
         except ValueError:
-            continue
-
-    # Try ISO format (handles timezone offsets like +00:00)
-    try:
-        dt = datetime.datetime.fromisoformat(date_string.replace('Z', '+00:00'))
-        return dt
-    except ValueError:
-        pass
+            pass
+    else:
+        dt = _parse_standard_twitter_date(date_string)
+        if dt is not None:
+            return dt
 
-    # Try to parse without day name if that's causing the issue
-    # E.g., "Dec 10 07:00:30 +0000 2024" instead of "Tue Dec 10 07:00:30 +0000 2024"
-    try:
-        # Extract components and reconstruct date
-        parts = date_string.split()
-        if len(parts) >= 6:
-            # Remove day name if present
-            new_date = ' '.join(parts[1:])
-            dt = datetime.datetime.strptime(new_date, "%b %d %H:%M:%S %z %Y")
+    # Variants of the Twitter format (no weekday and/or no offset), in one pass
+    match = _TWITTER_DATE_RE.fullmatch(date_string)
+    if match:
+        dt = _from_twitter_date_match(match)
+        if dt is not None:
             return dt
-    except ValueError:
-        pass
+
+    # Loosely padded ISO, e.g. "2024-1-5T7:0:0Z" (fromisoformat rejects it)
+    match = _LOOSE_ISO_DATE_RE.match(date_string)
+    if match:
+        try:
+            return datetime.datetime(*map(int, match.groups()), tzinfo=_UTC)
+        except ValueError:
+            pass
 
     raise TwitterAPIValidationError(f"Unrecognized date format: {date_string}")
 
 
+# date(1970, 1, 1).toordinal(); day numbers below are relative to the Unix epoch
+_EPOCH_ORDINAL = 719163
+
+
+def parse_twitter_timestamps(date_strings: Iterable[str]) -> List[int]:
+    """
+    Convert many Twitter date strings to Unix timestamps in one pass.
+
+    برای تبدیل دسته‌ای تاریخ‌های یک تایم‌لاین بزرگ (مرتب‌سازی/فیلتر بر اساس زمان)
+
+    The standard format ("Tue Dec 10 07:00:30 +0000 2024") is converted with
+    integer arithmetic, without building a datetime per string; anything else
+    goes through :func:`parse_twitter_date`.
+
+    Args:
+        date_strings: Date strings in any format parse_twitter_date accepts
+
+    Returns:
+        List of Unix timestamps (seconds), in input order
+
+    Raises:
+        TwitterAPIValidationError: If a date string is invalid
+    """
+    months = _MONTHS
+    weekdays = _WEEKDAYS
+    toordinal = datetime.date.toordinal
+    date = datetime.date
+    timestamps = []
+    append = timestamps.append
+    for date_string in date_strings:
+        parts = date_string.split(" ")
+        if len(parts) == 6 and parts[0] in weekdays and parts[1] in months:
+            day, clock, offset, year = parts[2], parts[3], parts[4], parts[5]
+            if (len(clock) == 8 and clock[2] == ":" and clock[5] == ":"
+                    and len(offset) == 5 and offset[0] in "+-"
+                    and (clock[:2] + clock[3:5] + clock[6:] + offset[1:]).isdigit()):
+                try:
+                    days = toordinal(date(int(year), months[parts[1]], int(day))) - _EPOCH_ORDINAL
+                    hour, minute, second = int(clock[:2]), int(clock[3:5]), int(clock[6:])
+                    offset_hours, offset_mins = int(offset[1:3]), int(offset[3:])
+                except ValueError:
+                    pass
+                else:
+                    # out-of-range fields ("99:99:99", "+2400", "+0099") are left to
+                    # parse_twitter_date, which rejects them like datetime() does
+                    if (hour < 24 and minute < 60 and second < 60
+                            and offset_hours < 24 and offset_mins < 60):
+                        seconds = hour * 3600 + minute * 60 + second
+                        offset_seconds = offset_hours * 3600 + offset_mins * 60
+                        if offset[0] == "-":
+                            offset_seconds = -offset_seconds
+                        append(days * 86400 + seconds - offset_seconds)
+                        continue
+        append(datetime_to_unix_timestamp(parse_twitter_date(date_string)))
+    return timestamps
+
+
+def _format_utc_offset(dt: datetime.datetime) -> str:
+    """Format the UTC offset of an aware datetime like strftime's ``%z`` (e.g. "+0330")."""
+    offset = dt.utcoffset()
+    if not offset:
+        return "+0000"
+    seconds = int(offset.total_seconds())
+    sign = "-" if seconds < 0 else "+"
+    minutes, seconds = divmod(abs(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if seconds:
+        return f"{sign}{hours:02d}{minutes:02d}{seconds:02d}"
+    return f"{sign}{hours:02d}{minutes:02d}"
+
+
 def format_twitter_date(dt: datetime.datetime) -> str:
     """
     Format datetime object into Twitter date string.
@@ -85,9 +255,28 @@ def format_twitter_date(dt: datetime.datetime) -> str:
         Date string in Twitter format
     """
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=datetime.timezone.utc)
+        dt = dt.replace(tzinfo=_UTC)
+
+    # Same output as strftime("%a %b %d %H:%M:%S %z %Y"), without parsing the
+    # format string or going through the C locale on every call
+    return (f"{_WEEKDAY_NAMES[dt.weekday()]} {_MONTH_NAMES[dt.month]} {dt.day:02d} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} {_format_utc_offset(dt)} {dt.year}")
+
+
+def format_display_date(dt: datetime.datetime) -> str:
+    """
+    Format datetime as "YYYY-MM-DD HH:MM:SS" for display.
 
-    return dt.strftime("%a %b %d %H:%M:%S %z %Y")
+    Same output as ``dt.strftime('%Y-%m-%d %H:%M:%S')`` (timezone is not shown),
+    but uses the C-level isoformat instead of parsing a format string per call.
+
+    Args:
+        dt: Datetime object
+
+    Returns:
+        Formatted date string
+    """
+    return dt.isoformat(sep=" ", timespec="seconds")[:19]
 
 
 def datetime_to_unix_timestamp(dt: datetime.datetime) -> int:
@@ -101,7 +290,7 @@ def datetime_to_unix_timestamp(dt: datetime.datetime) -> int:
         Unix timestamp in seconds
     """
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=datetime.timezone.utc)
+        dt = dt.replace(tzinfo=_UTC)
 
     return int(dt.timestamp())
 
@@ -116,7 +305,7 @@ def unix_timestamp_to_datetime(timestamp: Union[int, float]) -> datetime.datetim
     Returns:
         Datetime object with UTC timezone
     """
-    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+    return datetime.datetime.fromtimestamp(timestamp, tz=_UTC)
 
 
 def get_twitter_date_now() -> str:
@@ -126,7 +315,23 @@ def get_twitter_date_now() -> str:
     Returns:
         Current time as Twitter date string
     """
-    return format_twitter_date(datetime.datetime.now(datetime.timezone.utc))
+    return format_twitter_date(datetime.datetime.now(_UTC))
+
+
+def _time_string_to_timestamp(value: str, param_name: str) -> int:
+    """
+    Convert a time parameter given as a string to a Unix timestamp.
+
+    Numeric strings are checked first with a character test, so they never
+    go through the date parsers (and their failed-parse exceptions).
+    """
+    s = value.strip()
+    if (s[1:] if s.startswith("-") else s).isdecimal():
+        return int(s)
+    try:
+        return datetime_to_unix_timestamp(parse_twitter_date(s))
+    except TwitterAPIValidationError:
+        raise TwitterAPIValidationError(f"Invalid {param_name} format: {value}")
 
 
 def validate_time_range(since_time: Optional[Union[int, str, datetime.datetime]] = None,
@@ -152,14 +357,7 @@ def validate_time_range(since_time: Optional[Union[int, str, datetime.datetime]]
         if isinstance(since_time, (int, float)):
             since_timestamp = int(since_time)
         elif isinstance(since_time, str):
-            try:
-                since_timestamp = datetime_to_unix_timestamp(parse_twitter_date(since_time))
-            except TwitterAPIValidationError:
-                # Try parsing as Unix timestamp
-                try:
-                    since_timestamp = int(since_time)
-                except ValueError:
-                    raise TwitterAPIValidationError(f"Invalid since_time format: {since_time}")
+            since_timestamp = _time_string_to_timestamp(since_time, "since_time")
         elif isinstance(since_time, datetime.datetime):
             since_timestamp = datetime_to_unix_timestamp(since_time)
         else:
@@ -170,14 +368,7 @@ def validate_time_range(since_time: Optional[Union[int, str, datetime.datetime]]
         if isinstance(until_time, (int, float)):
             until_timestamp = int(until_time)
         elif isinstance(until_time, str):
-            try:
-                until_timestamp = datetime_to_unix_timestamp(parse_twitter_date(until_time))
-            except TwitterAPIValidationError:
-                # Try parsing as Unix timestamp
-                try:
-                    until_timestamp = int(until_time)
-                except ValueError:
-                    raise TwitterAPIValidationError(f"Invalid until_time format: {until_time}")
+            until_timestamp = _time_string_to_timestamp(until_time, "until_time")
         elif isinstance(until_time, datetime.datetime):
             until_timestamp = datetime_to_unix_timestamp(until_time)
         else:
@@ -204,8 +395,9 @@ def format_datetime_for_twitter_query(dt: datetime.datetime) -> str:
     """
     # Ensure the datetime is in UTC
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=datetime.timezone.utc)
+        dt = dt.replace(tzinfo=_UTC)
     else:
-        dt = dt.astimezone(datetime.timezone.utc)
+        dt = dt.astimezone(_UTC)
 
-    return dt.strftime("%Y-%m-%d_%H:%M:%S_UTC")
\ No newline at end of file
+    return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}_"
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}_UTC")
\ No newline at end of file
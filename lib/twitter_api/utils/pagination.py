@@ -4,7 +4,9 @@ Pagination utilities for TwitterAPI.io client.
 ابزارهای صفحه‌بندی برای کلاینت TwitterAPI.io که مشکلات خاص این API را مدیریت می‌کند
 """
 import logging
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union, Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union, Tuple
 
 from lib.twitter_api.exceptions import TwitterAPIPaginationError
 
@@ -12,6 +14,39 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Sentinel returned by next() when the current page is exhausted
+_PAGE_END = object()
+
+# Sentinel for "key not in response" (distinct from a None/False value)
+_MISSING = object()
+
+# Shared worker threads for speculative next-page requests (created on first use)
+PREFETCH_WORKERS = 4
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def submit_prefetch(request_func: Callable[[str], Dict[str, Any]], cursor: str) -> Future:
+    """
+    Start fetching a page in the background.
+
+    پیش‌واکشی صفحه بعد در پس‌زمینه تا درخواست شبکه با پردازش صفحه فعلی هم‌پوشانی داشته باشد
+
+    Args:
+        request_func: Function that makes the request and takes a cursor parameter
+        cursor: Cursor of the page to fetch
+
+    Returns:
+        Future resolving to the page's response data
+    """
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _prefetch_executor_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(
+                    max_workers=PREFETCH_WORKERS, thread_name_prefix="twitter-api-prefetch")
+    return _prefetch_executor.submit(request_func, cursor)
+
 
 def extract_pagination_info(response_data: Dict[str, Any]) -> Tuple[bool, str]:
     """
@@ -19,21 +54,23 @@ def extract_pagination_info(response_data: Dict[str, Any]) -> Tuple[bool, str]:
 
     Handles different pagination formats and API inconsistencies.
     """
-    if "has_next_page" in response_data and "next_cursor" in response_data:
-        has_next_page = response_data.get("has_next_page", False)
-        next_cursor = response_data.get("next_cursor", "")
+    # One lookup per key; the common has_next_page/next_cursor pair needs only two
+    get = response_data.get
+    has_next_page = get("has_next_page", _MISSING)
+    next_cursor = get("next_cursor", _MISSING)
+    if has_next_page is not _MISSING and next_cursor is not _MISSING:
         if has_next_page and not next_cursor:
             logger.debug("API inconsistency: has_next_page=True but next_cursor empty")
             return False, ""
         return has_next_page, next_cursor
-    for cursor_key in ["next_cursor", "next_token", "next_page"]:
-        if cursor_key in response_data:
-            cursor_value = response_data.get(cursor_key, "")
-            if cursor_value:
-                return True, cursor_value
+    if next_cursor is not _MISSING and next_cursor:
+        return True, next_cursor
+    next_cursor = get("next_token") or get("next_page")
+    if next_cursor:
+        return True, next_cursor
     return False, ""
 
-def paginate_resource(
+def paginate_resource_iter(
     request_func: Callable[[str], Dict[str, Any]],
     resource_key: str,
     max_pages: Optional[int] = None,
@@ -42,9 +79,12 @@ def paginate_resource(
     initial_cursor: str = "",
     max_empty_pages: int = 3,  # افزایش به 3 برای تحمل بیشتر
     expected_items_per_page: int = 20,  # برای هشدار صفحات ناقص
-) -> List[Dict[str, Any]]:
+) -> Iterator[Dict[str, Any]]:
     """
-    Paginate through a resource in TwitterAPI.io.
+    Paginate through a resource in TwitterAPI.io, yielding items as pages arrive.
+
+    صفحه بعد تنها زمانی درخواست می‌شود که آیتم‌های صفحه فعلی مصرف شده باشند،
+    بنابراین حافظه به اندازه یک صفحه است و با ``islice`` می‌توان زودتر متوقف شد.
 
     Args:
         request_func: Function that makes the request
@@ -56,26 +96,25 @@ def paginate_resource(
         max_empty_pages: Max consecutive empty pages
         expected_items_per_page: Expected items per page
 
-    Returns:
-        List of items
+    Yields:
+        Items of each page, in order
 
     Raises:
         TwitterAPIPaginationError: If pagination fails
     """
-    all_items = []
     cursor = initial_cursor
     page_count = 0
     empty_page_count = 0
-    items_needed = max_items if max_items is not None else float('inf')
+    item_count = 0
 
     while True:
         # بررسی محدودیت‌های کلی
         if max_pages is not None and page_count >= max_pages:
             logger.info(f"Stopping: Reached max pages ({max_pages})")
-            break
-        if len(all_items) >= items_needed:
-            logger.info(f"Stopping: Reached max items ({len(all_items)})")
-            break
+            return
+        if max_items is not None and item_count >= max_items:
+            logger.info(f"Stopping: Reached max items ({item_count})")
+            return
 
         # درخواست صفحه
         try:
@@ -97,37 +136,71 @@ def paginate_resource(
         # بررسی تعداد آیتم‌ها
         if len(items) < expected_items_per_page and items:
             logger.warning(
-                f"Page {page_count}: Only {len(items)} items received, expected {expected_items_per_page}"
+                "Page %d: Only %d items received, expected %d",
+                page_count, len(items), expected_items_per_page,
             )
         if not items:
             empty_page_count += 1
-            logger.debug(f"Page {page_count}: Empty")
+            logger.debug("Page %d: Empty", page_count)
         else:
             empty_page_count = 0
-            all_items.extend(items)
-            logger.debug(f"Page {page_count}: Added {len(items)} items, total: {len(all_items)}")
 
-        # بررسی محدودیت آیتم‌ها
-        if max_items is not None and len(all_items) >= max_items:
-            all_items = all_items[:max_items]
-            logger.info(f"Stopping: Reached max items ({max_items})")
-            break
+            # بررسی محدودیت آیتم‌ها
+            if max_items is not None and item_count + len(items) >= max_items:
+                yield from items[:max_items - item_count]
+                logger.info(f"Stopping: Reached max items ({max_items})")
+                return
+
+            item_count += len(items)
+            logger.debug("Page %d: Added %d items, total: %d", page_count, len(items), item_count)
+            yield from items
 
         # بررسی صفحه بعدی
         has_next_page, next_cursor = extract_pagination_info(response_data)
-        logger.debug(f"Page {page_count}: has_next_page={has_next_page}, next_cursor={next_cursor}")
+        logger.debug("Page %d: has_next_page=%s, next_cursor=%s", page_count, has_next_page, next_cursor)
         if not has_next_page or not next_cursor:
             logger.info("Stopping: No next page available")
-            break
+            return
 
         # بررسی صفحات خالی
         if stop_on_empty and empty_page_count >= max_empty_pages:
             logger.warning(f"Stopping: {empty_page_count} consecutive empty pages")
-            break
+            return
 
         cursor = next_cursor
 
-    return all_items
+
+def paginate_resource(
+    request_func: Callable[[str], Dict[str, Any]],
+    resource_key: str,
+    max_pages: Optional[int] = None,
+    max_items: Optional[int] = None,
+    stop_on_empty: bool = False,
+    initial_cursor: str = "",
+    max_empty_pages: int = 3,
+    expected_items_per_page: int = 20,
+) -> List[Dict[str, Any]]:
+    """
+    Paginate through a resource in TwitterAPI.io.
+
+    Collects :func:`paginate_resource_iter` into a list; see it for the arguments.
+
+    Returns:
+        List of items
+
+    Raises:
+        TwitterAPIPaginationError: If pagination fails
+    """
+    return list(paginate_resource_iter(
+        request_func,
+        resource_key,
+        max_pages=max_pages,
+        max_items=max_items,
+        stop_on_empty=stop_on_empty,
+        initial_cursor=initial_cursor,
+        max_empty_pages=max_empty_pages,
+        expected_items_per_page=expected_items_per_page,
+    ))
 
 class PaginatedIterator(Iterable[T]):
     """
@@ -137,6 +210,11 @@ class PaginatedIterator(Iterable[T]):
     دریافت می‌کند و امکان پیمایش تمام نتایج را فراهم می‌سازد.
     """
 
+    __slots__ = ("request_func", "resource_key", "transform_func", "max_pages", "max_items",
+                 "initial_cursor", "max_empty_pages", "prefetch", "cursor", "current_page",
+                 "_page_iter", "page_count", "item_count", "has_next_page", "empty_page_count",
+                 "_next_page_future")
+
     def __init__(
         self,
         request_func: Callable[[str], Dict[str, Any]],
@@ -146,6 +224,7 @@ class PaginatedIterator(Iterable[T]):
         max_items: Optional[int] = None,
         initial_cursor: str = "",
         max_empty_pages: int = 1,
+        prefetch: bool = False,
     ):
         """
         Initialize paginated iterator.
@@ -158,6 +237,10 @@ class PaginatedIterator(Iterable[T]):
             max_items: Maximum number of items to retrieve (None for unlimited)
             initial_cursor: Initial cursor value
             max_empty_pages: Maximum number of consecutive empty pages before stopping
+            prefetch: Request the next page in the background as soon as the
+                current one arrives (only when the current page cannot satisfy
+                max_items / max_pages; an abandoned iterator may still cost
+                one extra request)
         """
         self.request_func = request_func
         self.resource_key = resource_key
@@ -166,56 +249,29 @@ class PaginatedIterator(Iterable[T]):
         self.max_items = max_items
         self.initial_cursor = initial_cursor
         self.max_empty_pages = max_empty_pages
+        self.prefetch = prefetch
 
         # Initialize state
         self.cursor = initial_cursor
         self.current_page = []
-        self.current_index = 0
+        self._page_iter = iter(())
         self.page_count = 0
         self.item_count = 0
         self.has_next_page = True
         self.empty_page_count = 0
+        self._next_page_future: Optional[Future] = None
 
     def __iter__(self):
         return self
 
     def __next__(self) -> T:
         """Get the next item from the iterator."""
-        # Check if we've reached the maximum number of items
-        if self.max_items is not None and self.item_count >= self.max_items:
-            raise StopIteration
-
-        # If we've exhausted the current page, fetch the next page
-        if self.current_index >= len(self.current_page):
-            # Check if we've reached the maximum number of pages
-            if self.max_pages is not None and self.page_count >= self.max_pages:
-                raise StopIteration
-
-            # Check if we've seen too many consecutive empty pages
-            if self.empty_page_count >= self.max_empty_pages:
-                raise StopIteration
-
-            # Check if there's a next page
-            if not self.has_next_page:
-                raise StopIteration
-
-            # Fetch the next page
-            self._fetch_next_page()
-
-            # If the page is empty, recursively try again or stop
-            if not self.current_page:
-                self.empty_page_count += 1
-                if self.empty_page_count >= self.max_empty_pages:
-                    raise StopIteration
-                if self.has_next_page:
-                    return self.__next__()
-                else:
-                    raise StopIteration
-
-        # Get the next item
-        item = self.current_page[self.current_index]
-        self.current_index += 1
-        self.item_count += 1
+        # Hot path: one next() on the current page's list iterator; the
+        # limit checks only run at page boundaries (in _advance_page)
+        item = next(self._page_iter, _PAGE_END)
+        while item is _PAGE_END:
+            self._advance_page()
+            item = next(self._page_iter, _PAGE_END)
 
         # Transform the item if a transform function is provided
         if self.transform_func is not None:
@@ -223,10 +279,40 @@ class PaginatedIterator(Iterable[T]):
 
         return item
 
+    def _advance_page(self) -> None:
+        """Fetch the next page into ``_page_iter``, or raise StopIteration if iteration is over."""
+        # Check if we've reached the maximum number of items
+        if self.max_items is not None and self.item_count >= self.max_items:
+            raise StopIteration
+
+        # Check if we've reached the maximum number of pages
+        if self.max_pages is not None and self.page_count >= self.max_pages:
+            raise StopIteration
+
+        # Check if we've seen too many consecutive empty pages
+        if self.empty_page_count >= self.max_empty_pages:
+            raise StopIteration
+
+        # Check if there's a next page
+        if not self.has_next_page:
+            raise StopIteration
+
+        # Fetch the next page; trim it so the iterator never yields past max_items
+        self._fetch_next_page()
+        page = self.current_page
+        if self.max_items is not None and len(page) > self.max_items - self.item_count:
+            page = page[:self.max_items - self.item_count]
+        self.item_count += len(page)
+        self._page_iter = iter(page)
+
     def _fetch_next_page(self) -> None:
         """Fetch the next page of results."""
-        # Make the request
-        response_data = self.request_func(self.cursor)
+        # Make the request (or collect the prefetched page)
+        if self._next_page_future is not None:
+            future, self._next_page_future = self._next_page_future, None
+            response_data = future.result()
+        else:
+            response_data = self.request_func(self.cursor)
         self.page_count += 1
 
         # Extract items from the response
@@ -242,9 +328,8 @@ class PaginatedIterator(Iterable[T]):
                 f"Expected a list for resource key '{self.resource_key}', got {type(items).__name__}"
             )
 
-        # Update current page and reset index
+        # Update current page
         self.current_page = items
-        self.current_index = 0
 
         # Update empty page counter
         if not items:
@@ -255,4 +340,20 @@ class PaginatedIterator(Iterable[T]):
         # Extract pagination information
         has_next_page, next_cursor = extract_pagination_info(response_data)
         self.has_next_page = has_next_page and bool(next_cursor)
-        self.cursor = next_cursor
\ No newline at end of file
+        self.cursor = next_cursor
+
+        if self.prefetch:
+            self._prefetch_next_page()
+
+    def _prefetch_next_page(self) -> None:
+        """Start fetching the next page if the consumer can still need it."""
+        if not self.has_next_page:
+            return
+        # _advance_page stops after max_empty_pages consecutive empty pages
+        if self.empty_page_count >= self.max_empty_pages:
+            return
+        if self.max_pages is not None and self.page_count >= self.max_pages:
+            return
+        if self.max_items is not None and self.item_count + len(self.current_page) >= self.max_items:
+            return
+        self._next_page_future = submit_prefetch(self.request_func, self.cursor)
\ No newline at end of file
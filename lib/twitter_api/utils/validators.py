@@ -9,6 +9,24 @@ from typing import Any, Dict, List, Optional, Union
 
 from lib.twitter_api.exceptions import TwitterAPIValidationError
 
+# Compiled patterns passed to validate_string_param as strings, keyed by pattern
+_PATTERN_CACHE: Dict[str, "re.Pattern[str]"] = {}
+
+
+def _compiled_pattern(pattern: Union[str, "re.Pattern[str]"]) -> "re.Pattern[str]":
+    """Return ``pattern`` compiled, compiling each pattern string only once."""
+    if not isinstance(pattern, str):
+        return pattern
+    compiled = _PATTERN_CACHE.get(pattern)
+    if compiled is None:
+        compiled = _PATTERN_CACHE[pattern] = re.compile(pattern)
+    return compiled
+
+
+# Accepted (lower-cased) string forms in validate_boolean_param
+_TRUE_STRINGS = frozenset(("true", "1", "yes", "y"))
+_FALSE_STRINGS = frozenset(("false", "0", "no", "n"))
+
 
 def validate_api_key(api_key: str) -> None:
     """
@@ -89,7 +107,7 @@ def validate_numeric_param(value: Any, param_name: str, min_value: Optional[Unio
 
 
 def validate_string_param(value: Any, param_name: str, max_length: Optional[int] = None,
-                        pattern: Optional[str] = None) -> str:
+                        pattern: Optional[Union[str, "re.Pattern[str]"]] = None) -> str:
     """
     Validate string parameter.
 
@@ -97,7 +115,7 @@ def validate_string_param(value: Any, param_name: str, max_length: Optional[int]
         value: Value to validate
         param_name: Name of the parameter for error messages
         max_length: Maximum allowed length
-        pattern: Regex pattern to match
+        pattern: Regex pattern to match (string or pre-compiled pattern)
 
     Returns:
         Validated string value
@@ -111,7 +129,7 @@ def validate_string_param(value: Any, param_name: str, max_length: Optional[int]
     if max_length is not None and len(value) > max_length:
         raise TwitterAPIValidationError(f"Parameter {param_name} must be at most {max_length} characters long")
 
-    if pattern is not None and not re.match(pattern, value):
+    if pattern is not None and not _compiled_pattern(pattern).match(value):
         raise TwitterAPIValidationError(f"Parameter {param_name} has invalid format")
 
     return value
@@ -135,9 +153,10 @@ def validate_boolean_param(value: Any, param_name: str) -> bool:
         return value
 
     if isinstance(value, str):
-        if value.lower() in ("true", "1", "yes", "y"):
+        lowered = value.lower()
+        if lowered in _TRUE_STRINGS:
             return True
-        elif value.lower() in ("false", "0", "no", "n"):
+        if lowered in _FALSE_STRINGS:
             return False
 
     if isinstance(value, int) and value in (0, 1):
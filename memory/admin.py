@@ -10,11 +10,13 @@ class TopicAdmin(admin.ModelAdmin):
 @admin.register(UserRelationship)
 class UserRelationshipAdmin(admin.ModelAdmin):
     list_display = ('from_user', 'relationship_type', 'to_user', 'strength')
+    list_select_related = ('from_user', 'to_user')
     search_fields = ('from_user__username', 'to_user__username')
     list_filter = ('relationship_type',)
 
 @admin.register(MemoryRecord)
 class MemoryRecordAdmin(admin.ModelAdmin):
     list_display = ('topic', 'memory_type', 'content_type', 'created_at')
+    list_select_related = ('topic',)
     search_fields = ('topic__name', 'summary')
     list_filter = ('memory_type', 'content_type')
\ No newline at end of file
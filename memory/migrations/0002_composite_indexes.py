@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collector', '0006_remove_searchquery_last_tweet_timestamp_and_more'),
+        ('memory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='memoryrecord',
+            index=models.Index(fields=['topic', 'memory_type', 'content_type'], name='memory_memo_topic_i_23b2c8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='memoryrecord',
+            index=models.Index(fields=['topic', '-created_at'], name='memory_memo_topic_i_626802_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='memoryrecord',
+            index=models.Index(fields=['topic', 'start_date', 'end_date'], name='memory_memo_topic_i_b3b932_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userrelationship',
+            index=models.Index(fields=['from_user', 'relationship_type', '-strength'], name='memory_user_from_us_880dc5_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memory', '0002_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='memoryrecord',
+            options={'get_latest_by': 'created_at', 'ordering': ['-created_at'], 'verbose_name': 'Memory Record', 'verbose_name_plural': 'Memory Records'},
+        ),
+        migrations.RemoveIndex(
+            model_name='memoryrecord',
+            name='memory_memo_created_fda3bf_idx',
+        ),
+        migrations.AddIndex(
+            model_name='memoryrecord',
+            index=models.Index(fields=['-created_at'], name='memory_memo_created_4429f0_idx'),
+        ),
+    ]
@@ -44,6 +44,8 @@ class UserRelationship(models.Model):
             models.Index(fields=['relationship_type']),
             models.Index(fields=['strength']),
             models.Index(fields=['last_seen']),
+            # «قوی‌ترین روابط کاربر X از نوع Y» بدون مرتب‌سازی جداگانه
+            models.Index(fields=['from_user', 'relationship_type', '-strength']),
         ]
         verbose_name = 'User Relationship'
         verbose_name_plural = 'User Relationships'
@@ -78,11 +80,18 @@ class MemoryRecord(models.Model):
 
     class Meta:
         indexes = [
+            # کوئری‌های معمول: رکوردهای یک موضوع بر اساس نوع، زمان ایجاد یا بازه زمانی
+            models.Index(fields=['topic', 'memory_type', 'content_type']),
+            models.Index(fields=['topic', '-created_at']),
+            models.Index(fields=['topic', 'start_date', 'end_date']),
+            # فیلتر فقط بر اساس نوع (مثلاً list_filter ادمین) با ایندکس‌های بالا که با topic شروع می‌شوند پوشش داده نمی‌شود
             models.Index(fields=['memory_type']),
             models.Index(fields=['content_type']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['-created_at']),
             models.Index(fields=['start_date', 'end_date']),
         ]
+        ordering = ['-created_at']
+        get_latest_by = 'created_at'
         verbose_name = 'Memory Record'
         verbose_name_plural = 'Memory Records'
 
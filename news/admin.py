@@ -10,5 +10,6 @@ class NewsSourceAdmin(admin.ModelAdmin):
 @admin.register(NewsArticle)
 class NewsArticleAdmin(admin.ModelAdmin):
     list_display = ('title', 'source', 'published_at', 'is_valid')
+    list_select_related = ('source',)
     search_fields = ('title', 'content')
     list_filter = ('is_valid', 'published_at')
\ No newline at end of file
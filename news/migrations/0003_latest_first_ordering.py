@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_boolean_and_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='newsarticle',
+            options={'get_latest_by': 'published_at', 'ordering': ['-published_at'], 'verbose_name': 'News Article', 'verbose_name_plural': 'News Articles'},
+        ),
+        migrations.RemoveIndex(
+            model_name='newsarticle',
+            name='news_newsar_publish_df29a9_idx',
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['-published_at'], name='news_newsar_publish_db2481_idx'),
+        ),
+    ]
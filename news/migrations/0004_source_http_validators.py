@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_latest_first_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newssource',
+            name='etag',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='last_modified',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
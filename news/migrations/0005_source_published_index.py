@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_source_http_validators'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['source', '-published_at'], name='news_newsar_source__69bb5b_idx'),
+        ),
+    ]
@@ -7,9 +7,12 @@ class NewsSource(models.Model):
     rss_url = models.URLField(unique=True)
     description = models.TextField(blank=True)
     logo_url = models.URLField(blank=True, null=True)
-    is_active = models.BooleanField(default=True)
+    is_active = models.BooleanField(default=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     last_fetch = models.DateTimeField(null=True, blank=True)
+    # اعتبارسنج‌های HTTP آخرین دریافت، برای GET شرطی (پاسخ 304 یعنی فید تغییری نکرده)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
     fetch_interval = models.IntegerField(default=60)
     total_articles = models.IntegerField(default=0)
 
@@ -31,15 +34,20 @@ class NewsArticle(models.Model):
     summary = models.TextField(blank=True)
     content = models.TextField(blank=True)
     image_url = models.URLField(blank=True, null=True)
-    is_valid = models.BooleanField(default=True)
+    is_valid = models.BooleanField(default=True, db_index=True)
     importance_score = models.FloatField(default=0.0)
     keywords = models.JSONField(default=list, blank=True)  # جایگزین ArrayField
 
     class Meta:
         indexes = [
-            models.Index(fields=['published_at']),
+            models.Index(fields=['-published_at']),
             models.Index(fields=['importance_score']),
+            models.Index(fields=['source', '-published_at']),
+            # ایندکس جزئی: فقط مقالات معتبر، به ترتیب زمان انتشار
+            models.Index(fields=['-published_at'], condition=models.Q(is_valid=True), name='news_valid_pub_idx'),
         ]
+        ordering = ['-published_at']
+        get_latest_by = 'published_at'
         verbose_name = 'News Article'
         verbose_name_plural = 'News Articles'
 
@@ -1,12 +1,29 @@
+import calendar
 import logging
+from datetime import datetime, timezone as dt_timezone
 import feedparser
+import requests
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import F
 from collector.models import Tweet, TwitterUser, SearchQuery  # اصلاح import
 from .models import NewsSource, NewsArticle
 
+# پارسر سریع مبتنی بر lxml در صورت نصب بودن؛ در غیر این صورت feedparser
+try:
+    import fastfeedparser
+except ImportError:
+    fastfeedparser = None
+
 logger = logging.getLogger(__name__)
 
+# فیلدهایی که برای مقاله‌های موجود (بر اساس url) به‌روزرسانی می‌شوند؛
+# source عمداً نیست: مقاله متعلق به منبعی می‌ماند که اول آن را جمع‌آوری کرده (total_articles درست می‌ماند)
+ARTICLE_UPDATE_FIELDS = ['title', 'guid', 'published_at', 'summary', 'content', 'is_valid']
+
+# مهلت دریافت فید (ثانیه)
+FEED_TIMEOUT = 10
+
 class NewsCollectorService:
     def collect_from_source(self, source):
         """Collect news articles from an RSS source"""
@@ -18,47 +35,103 @@ class NewsCollectorService:
             'errors': 0
         }
         try:
-            feed = feedparser.parse(source.rss_url)
-            if feed.bozo:
-                logger.error(f"Error parsing feed for {source.name}: {str(feed.bozo_exception)}")
+            entries = self._parse_feed(source)
+            if entries is None:
                 result['errors'] += 1
                 return result
-            for entry in feed.entries:
-                with transaction.atomic():
-                    article, created = self._process_entry(entry, source)
-                    if created:
-                        result['added'] += 1
-                    else:
-                        result['updated'] += 1
-                    result['total'] += 1
-            source.last_fetch = timezone.now()
-            source.total_articles = NewsArticle.objects.filter(source=source).count()
-            source.save(update_fields=['last_fetch', 'total_articles'])
+            # یک مقاله به ازای هر URL (آخرین ورودی، مانند update_or_create پشت سر هم)
+            articles = {}
+            for entry in entries:
+                article = self._build_article(entry, source)
+                articles[article.url] = article
+            with transaction.atomic():
+                # قفل ردیف منبع: اجراهای هم‌زمان برای یک منبع پشت سر هم انجام می‌شوند
+                NewsSource.objects.select_for_update().filter(pk=source.pk).exists()
+                existing = set(
+                    NewsArticle.objects.filter(url__in=articles).values_list('url', flat=True)
+                )
+                NewsArticle.objects.bulk_create(
+                    articles.values(),
+                    update_conflicts=True,
+                    unique_fields=['url'],
+                    update_fields=ARTICLE_UPDATE_FIELDS,
+                )
+                # «افزوده» یعنی ردیف‌هایی که واقعاً با این منبع درج شدند؛ URL ای که منبع دیگری
+                # هم‌زمان (پس از بررسی existing) درج کرده، متعلق به آن منبع می‌ماند و شمرده نمی‌شود
+                new_urls = [url for url in articles if url not in existing]
+                result['total'] = len(articles)
+                result['added'] = NewsArticle.objects.filter(url__in=new_urls, source=source).count() if new_urls else 0
+                result['updated'] = result['total'] - result['added']
+                source.last_fetch = timezone.now()
+                NewsSource.objects.filter(pk=source.pk).update(
+                    last_fetch=source.last_fetch,
+                    total_articles=F('total_articles') + result['added'],
+                    etag=source.etag,
+                    last_modified=source.last_modified,
+                )
+            source.total_articles += result['added']
             return result
         except Exception as e:
             logger.error(f"Error collecting from {source.name}: {str(e)}")
             result['errors'] += 1
             return result
 
-    def _process_entry(self, entry, source):
-        """Process a single RSS entry"""
-        from datetime import datetime
-        import pytz
+    def _parse_feed(self, source):
+        """
+        Fetch and parse the source's feed; returns its entries, or None if the feed is malformed.
+
+        Uses a conditional GET with the ETag/Last-Modified of the previous fetch;
+        an unchanged feed (304) yields no entries. New validators are set on
+        ``source`` and saved by collect_from_source.
+        """
+        if fastfeedparser is not None:
+            headers = {}
+            if source.etag:
+                headers['If-None-Match'] = source.etag
+            if source.last_modified:
+                headers['If-Modified-Since'] = source.last_modified
+            try:
+                response = requests.get(source.rss_url, headers=headers, timeout=FEED_TIMEOUT)
+                if response.status_code == 304:
+                    return []
+                response.raise_for_status()
+                entries = fastfeedparser.parse(response.content).entries
+            except Exception as e:
+                logger.error(f"Error parsing feed for {source.name}: {str(e)}")
+                return None
+            source.etag = response.headers.get('ETag', '')
+            source.last_modified = response.headers.get('Last-Modified', '')
+            return entries
+        feed = feedparser.parse(
+            source.rss_url, etag=source.etag or None, modified=source.last_modified or None
+        )
+        if feed.get('status') == 304:
+            return []
+        if feed.bozo:
+            logger.error(f"Error parsing feed for {source.name}: {str(feed.bozo_exception)}")
+            return None
+        source.etag = feed.get('etag', '')
+        source.last_modified = feed.get('modified', '')
+        return feed.entries
+
+    def _build_article(self, entry, source):
+        """Build an unsaved NewsArticle from a single RSS entry"""
         published = entry.get('published_parsed')
         if published:
-            published_at = datetime.fromtimestamp(datetime(*published[:6]).timestamp(), pytz.UTC)
+            # published_parsed یک struct_time در UTC است
+            published_at = datetime.fromtimestamp(calendar.timegm(published), tz=dt_timezone.utc)
+        elif entry.get('published') and fastfeedparser is not None:
+            # fastfeedparser تاریخ را به صورت رشته ISO 8601 در UTC برمی‌گرداند
+            published_at = datetime.fromisoformat(entry['published'])
         else:
             published_at = timezone.now()
-        article, created = NewsArticle.objects.update_or_create(
+        return NewsArticle(
             url=entry.get('link', ''),
-            defaults={
-                'title': entry.get('title', 'Untitled'),
-                'source': source,
-                'guid': entry.get('id', entry.get('link', '')),
-                'published_at': published_at,
-                'summary': entry.get('summary', ''),
-                'content': entry.get('content', [{}])[0].get('value', ''),
-                'is_valid': True
-            }
-        )
-        return article, created
\ No newline at end of file
+            title=entry.get('title', 'Untitled'),
+            source=source,
+            guid=entry.get('id', entry.get('link', '')),
+            published_at=published_at,
+            summary=entry.get('summary', ''),
+            content=entry.get('content', [{}])[0].get('value', ''),
+            is_valid=True,
+        )
\ No newline at end of file
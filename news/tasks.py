@@ -1,5 +1,5 @@
 import logging
-from celery import shared_task
+from celery import chord, shared_task
 from .services import NewsCollectorService
 from .models import NewsSource
 
@@ -7,16 +7,34 @@ logger = logging.getLogger(__name__)
 
 @shared_task
 def collect_news():
-    """Collect news articles from active sources"""
+    """Collect news articles from active sources (one subtask per source, run in parallel)"""
     try:
-        service = NewsCollectorService()
-        sources = NewsSource.objects.filter(is_active=True)
-        total_collected = 0
-        for source in sources:
-            result = service.collect_from_source(source)
-            total_collected += result['total']
-        logger.info(f"Collected {total_collected} news articles")
-        return {'status': 'success', 'total_collected': total_collected}
+        source_ids = list(NewsSource.objects.filter(is_active=True).values_list('id', flat=True))
+        if not source_ids:
+            logger.info("Collected 0 news articles")
+            return {'status': 'success', 'total_collected': 0}
+        # هر منبع در یک worker جداگانه جمع‌آوری می‌شود؛ جمع نهایی در callback محاسبه می‌شود
+        chord(collect_news_from_source.s(source_id) for source_id in source_ids)(
+            summarize_news_collection.s()
+        )
+        return {'status': 'dispatched', 'sources': len(source_ids)}
     except Exception as e:
         logger.error(f"Error in collect_news: {str(e)}")
-        return {'status': 'error', 'error': str(e)}
\ No newline at end of file
+        return {'status': 'error', 'error': str(e)}
+
+@shared_task
+def collect_news_from_source(source_id):
+    """Collect news articles from a single source"""
+    try:
+        source = NewsSource.objects.get(id=source_id)
+    except NewsSource.DoesNotExist:
+        logger.error(f"News source {source_id} does not exist")
+        return {'source': None, 'total': 0, 'added': 0, 'updated': 0, 'errors': 1}
+    return NewsCollectorService().collect_from_source(source)
+
+@shared_task
+def summarize_news_collection(results):
+    """Sum the per-source results of collect_news"""
+    total_collected = sum(result['total'] for result in results)
+    logger.info(f"Collected {total_collected} news articles")
+    return {'status': 'success', 'total_collected': total_collected}
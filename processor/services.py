@@ -1,31 +1,91 @@
 import logging
+import re
+from collections import defaultdict
+from itertools import islice
 from django.utils import timezone
 from django.conf import settings
+from django.db.models import Count
 from collector.models import Tweet
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# الگوهای استخراج موجودیت‌ها (یک بار کامپایل می‌شوند)
+HASHTAG_RE = re.compile(r'#(\w+)')
+MENTION_RE = re.compile(r'@(\w+)')
+WORD_RE = re.compile(r'\b(\w{4,})\b')
+URL_RE = re.compile(r'https?://', re.IGNORECASE)
+
+# فهرست‌های ثابت؛ frozenset برای بررسی عضویت O(1) و بدون ساخت لیست در هر فراخوانی
+PERSIAN_STOP_WORDS = frozenset(['و', 'در', 'به', 'از', 'که', 'این', 'را', 'با', 'است', 'برای'])
+INAPPROPRIATE_WORDS = frozenset(['badword1', 'badword2', 'badword3'])
+
+
+def _build_inappropriate_matcher(words):
+    """Single-pass matcher over all words: Aho-Corasick if available, otherwise one alternation regex"""
+    if not words:
+        # الگوی خالی '' با هر متنی منطبق می‌شود
+        return lambda text: False
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for word in words:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    # کلمات بلندتر اول، تا الگو مستقل از ترتیب frozenset باشد
+    pattern = re.compile('|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True)))
+    return lambda text: pattern.search(text) is not None
+
+
+# تطبیق همه کلمات نامناسب در یک پیمایش متن، به جای یک جستجوی جدا برای هر کلمه
+_contains_inappropriate_word = _build_inappropriate_matcher(INAPPROPRIATE_WORDS)
+
+# بیشترین تعداد توییت دیگر یک کاربر در ساعت اخیر پیش از اسپم شمرده شدن
+SPAM_MAX_TWEETS_PER_HOUR = 15
+
+# بیشترین تعداد شناسه در هر UPDATE گروهی (محدودیت تعداد پارامترهای پایگاه داده)
+UPDATE_BATCH_SIZE = 500
+
 
 class TweetFilterService:
-    def filter_tweet(self, tweet, min_length=None):
+    # متن‌هایی که در ۲۴ ساعت اخیر بیش از یک بار آمده‌اند؛ فقط در طول filter_new_tweets پر است
+    _recent_duplicate_texts = None
+    _recent_cutoff = None
+    # تعداد توییت‌های یک ساعت اخیر کاربرانی که بیش از حد مجاز توییت کرده‌اند؛ فقط در طول filter_new_tweets
+    _busy_user_counts = None
+    _busy_cutoff = None
+
+    def __init__(self):
+        # تنظیمات یک بار برای هر سرویس (هر دسته) خوانده می‌شوند، نه برای هر توییت
+        self._min_length = settings.MIN_TWEET_LENGTH
+        self._filter_inappropriate = settings.FILTER_INAPPROPRIATE_CONTENT
+        self._filter_duplicates = settings.FILTER_DUPLICATES
+
+    def filter_tweet(self, tweet, min_length=None, text_lower=None):
         """Filter a tweet based on rules"""
-        min_length = min_length or settings.MIN_TWEET_LENGTH
+        min_length = min_length or self._min_length
         text = tweet.text
-        logger.info(f"Filtering tweet {tweet.tweet_id}: text='{text}', length={len(text)}")
+        logger.debug("Filtering tweet %s: text='%s', length=%d", tweet.tweet_id, text, len(text))
 
         if len(text) < min_length:
-            logger.info(f"Tweet {tweet.tweet_id} invalid: too_short")
+            logger.debug("Tweet %s invalid: too_short", tweet.tweet_id)
             return False, 'too_short'
-        if settings.FILTER_INAPPROPRIATE_CONTENT and self._contains_inappropriate_content(text):
-            logger.info(f"Tweet {tweet.tweet_id} invalid: inappropriate")
+        if self._filter_inappropriate and self._contains_inappropriate_content(
+            text_lower if text_lower is not None else text.lower()
+        ):
+            logger.debug("Tweet %s invalid: inappropriate", tweet.tweet_id)
             return False, 'inappropriate'
-        if settings.FILTER_DUPLICATES and self._is_duplicate(tweet):
-            logger.info(f"Tweet {tweet.tweet_id} invalid: duplicate")
+        if self._filter_duplicates and self._is_duplicate(tweet):
+            logger.debug("Tweet %s invalid: duplicate", tweet.tweet_id)
             return False, 'duplicate'
         if self._is_spam(tweet):
-            logger.info(f"Tweet {tweet.tweet_id} invalid: spam")
+            logger.debug("Tweet %s invalid: spam", tweet.tweet_id)
             return False, 'spam'
-        logger.info(f"Tweet {tweet.tweet_id} valid")
+        logger.debug("Tweet %s valid", tweet.tweet_id)
         return True, None
 
     def filter_new_tweets(self, hours=24):
@@ -37,34 +97,56 @@ class TweetFilterService:
             'invalid_reasons': {}
         }
         cutoff = timezone.now() - timezone.timedelta(hours=hours)
-        tweets = Tweet.objects.filter(collected_at__gte=cutoff, is_valid=True, invalid_reason__isnull=True)
-        result['total'] = tweets.count()
-
-        for tweet in tweets:
-            is_valid, reason = self.filter_tweet(tweet)
-            if not is_valid:
-                tweet.is_valid = False
-                tweet.invalid_reason = reason
-                tweet.save(update_fields=['is_valid', 'invalid_reason'])
-                result['invalid'] += 1
-                result['invalid_reasons'][reason] = result['invalid_reasons'].get(reason, 0) + 1
-            else:
-                result['valid'] += 1
+        tweets = Tweet.objects.filter(
+            collected_at__gte=cutoff, is_valid=True, invalid_reason__isnull=True
+        ).only('id', 'tweet_id', 'text', 'user', 'created_at')
+
+        # بررسی تکراری‌ها با یک کوئری GROUP BY برای کل دسته، به جای یک EXISTS برای هر توییت
+        if self._filter_duplicates:
+            self._recent_cutoff = timezone.now() - timezone.timedelta(hours=24)
+            self._recent_duplicate_texts = self._get_duplicate_texts_since(self._recent_cutoff)
+
+        # کاربران پرتوییت ساعت اخیر با یک کوئری GROUP BY، به جای یک COUNT برای هر توییت
+        self._busy_cutoff = timezone.now() - timezone.timedelta(hours=1)
+        self._busy_user_counts = self._get_busy_user_counts_since(self._busy_cutoff)
+
+        # شناسه توییت‌های نامعتبر به تفکیک دلیل؛ در پایان با یک UPDATE برای هر دلیل ذخیره می‌شوند
+        invalid_by_reason = defaultdict(list)
+        try:
+            # تعداد کل در همین پیمایش شمرده می‌شود؛ بدون کوئری COUNT جداگانه
+            for tweet in tweets.iterator(chunk_size=2000):
+                result['total'] += 1
+                is_valid, reason = self.filter_tweet(tweet)
+                if not is_valid:
+                    invalid_by_reason[reason].append(tweet.id)
+                    result['invalid'] += 1
+                    result['invalid_reasons'][reason] = result['invalid_reasons'].get(reason, 0) + 1
+                else:
+                    result['valid'] += 1
+        finally:
+            self._recent_duplicate_texts = self._recent_cutoff = None
+            self._busy_user_counts = self._busy_cutoff = None
+        for reason, ids in invalid_by_reason.items():
+            for start in range(0, len(ids), UPDATE_BATCH_SIZE):
+                Tweet.objects.filter(id__in=ids[start:start + UPDATE_BATCH_SIZE]).update(
+                    is_valid=False, invalid_reason=reason
+                )
         logger.info(f"Filtered {result['total']} tweets: {result['valid']} valid, {result['invalid']} invalid")
         return result
 
-    def extract_entities(self, tweet):
+    def extract_entities(self, tweet, text_lower=None):
         """Extract hashtags, mentions, and keywords from a tweet"""
-        import re
         text = tweet.text
+        if text_lower is None:
+            text_lower = text.lower()
         entities = {
-            'hashtags': re.findall(r'#(\w+)', text),
-            'mentions': re.findall(r'@(\w+)', text),
+            'hashtags': HASHTAG_RE.findall(text),
+            'mentions': MENTION_RE.findall(text),
             'keywords': []
         }
-        words = re.findall(r'\b(\w{4,})\b', text.lower())
-        stop_words = self._get_persian_stop_words()
-        entities['keywords'] = [w for w in words if w not in stop_words][:10]
+        # فقط ۱۰ کلیدواژه اول لازم است؛ پیمایش تنبل پس از آن متوقف می‌شود
+        words = (m.group(1) for m in WORD_RE.finditer(text_lower))
+        entities['keywords'] = list(islice((w for w in words if w not in PERSIAN_STOP_WORDS), 10))
 
         tweet.hashtags = entities['hashtags']
         tweet.mentions = entities['mentions']
@@ -72,12 +154,21 @@ class TweetFilterService:
         tweet.save(update_fields=['hashtags', 'mentions', 'keywords'])
         return entities
 
-    def _contains_inappropriate_content(self, text):
-        inappropriate_words = self._get_inappropriate_words()
-        text_lower = text.lower()
-        return any(word in text_lower for word in inappropriate_words)
+    def _contains_inappropriate_content(self, text_lower):
+        return _contains_inappropriate_word(text_lower)
+
+    def _get_duplicate_texts_since(self, cutoff):
+        """Texts of more than one tweet created since cutoff"""
+        rows = Tweet.objects.filter(created_at__gte=cutoff).values('text').annotate(
+            count=Count('id')
+        ).filter(count__gt=1).values_list('text', flat=True)
+        return set(rows)
 
     def _is_duplicate(self, tweet):
+        # توییت داخل بازه: تکراری است اگر متنش بیش از یک بار در بازه آمده باشد.
+        # توییت قدیمی‌تر از بازه (نادر) در شمارش نیست و با کوئری EXISTS بررسی می‌شود
+        if self._recent_duplicate_texts is not None and tweet.created_at >= self._recent_cutoff:
+            return tweet.text in self._recent_duplicate_texts
         cutoff = timezone.now() - timezone.timedelta(hours=24)
         duplicates = Tweet.objects.filter(
             text=tweet.text,
@@ -86,18 +177,26 @@ class TweetFilterService:
         return duplicates
 
     def _is_spam(self, tweet):
-        text = tweet.text
-        if text.count('http') > 2:
+        # بیش از دو لینک (بدون توجه به بزرگی و کوچکی حروف)؛ پیش از هر کوئری بررسی می‌شود
+        if len(URL_RE.findall(tweet.text)) > 2:
             return True
+        if self._busy_user_counts is not None:
+            # خود توییت (اگر در بازه باشد) از شمارش کم می‌شود
+            count = self._busy_user_counts.get(tweet.user_id, 0)
+            if tweet.created_at >= self._busy_cutoff:
+                count -= 1
+            return count > SPAM_MAX_TWEETS_PER_HOUR
         cutoff = timezone.now() - timezone.timedelta(hours=1)
+        # شمارش حداکثر تا آستانه + ۱؛ لازم نیست همه توییت‌های کاربر شمرده شوند
         recent_tweets = Tweet.objects.filter(
-            user=tweet.user,
+            user_id=tweet.user_id,
             created_at__gte=cutoff
-        ).exclude(id=tweet.id)
-        return recent_tweets.count() > 15
-
-    def _get_inappropriate_words(self):
-        return ['badword1', 'badword2', 'badword3']
+        ).exclude(id=tweet.id).values('id')[:SPAM_MAX_TWEETS_PER_HOUR + 1]
+        return recent_tweets.count() > SPAM_MAX_TWEETS_PER_HOUR
 
-    def _get_persian_stop_words(self):
-        return ['و', 'در', 'به', 'از', 'که', 'این', 'را', 'با', 'است', 'برای']
\ No newline at end of file
+    def _get_busy_user_counts_since(self, cutoff):
+        """Tweet counts since cutoff for users who posted more than SPAM_MAX_TWEETS_PER_HOUR"""
+        rows = Tweet.objects.filter(created_at__gte=cutoff).values('user_id').annotate(
+            count=Count('id')
+        ).filter(count__gt=SPAM_MAX_TWEETS_PER_HOUR).values_list('user_id', 'count')
+        return dict(rows)
@@ -23,14 +23,16 @@ def process_tweet(tweet_id):
     try:
         tweet = Tweet.objects.get(id=tweet_id)
         service = TweetFilterService()
-        is_valid, reason = service.filter_tweet(tweet)
+        # متن کوچک‌شده یک بار ساخته و در فیلتر و استخراج موجودیت‌ها استفاده می‌شود
+        text_lower = tweet.text.lower()
+        is_valid, reason = service.filter_tweet(tweet, text_lower=text_lower)
         if not is_valid:
             tweet.is_valid = False
             tweet.invalid_reason = reason
             tweet.save(update_fields=['is_valid', 'invalid_reason'])
             logger.info(f"Tweet {tweet_id} marked as invalid: {reason}")
             return {'status': 'success', 'tweet_id': tweet_id, 'is_valid': False, 'reason': reason}
-        entities = service.extract_entities(tweet)
+        entities = service.extract_entities(tweet, text_lower=text_lower)
         logger.info(f"Tweet {tweet_id} processed: valid with {len(entities['hashtags'])} hashtags")
         return {
             'status': 'success',